@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+"""
+Compare request throughput of the list and dashboard endpoints on SQLite
+and PostgreSQL, with and without persistent connections and pooling.
+
+Every profile runs in its own process against a throwaway test database,
+served over HTTP by one single-threaded server per worker (like gunicorn
+sync workers), so connection setup and reuse are part of the numbers:
+    python benchmark_database.py [--rows 5000] [--requests 400] [--workers 4]
+
+PostgreSQL profiles read the POSTGRES_* variables (project_tracker/database.py)
+and are skipped when no server answers. A local throwaway one:
+    docker run --rm -p 5432:5432 -e POSTGRES_PASSWORD=postgres postgres:16
+    POSTGRES_PASSWORD=postgres python benchmark_database.py
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+PROFILES = {
+    'sqlite': {'DATABASE_ENGINE': 'sqlite'},
+    'postgres, connect per request': {'DATABASE_ENGINE': 'postgresql', 'DATABASE_CONN_MAX_AGE': '0'},
+    'postgres, persistent': {'DATABASE_ENGINE': 'postgresql', 'DATABASE_CONN_MAX_AGE': '60'},
+    'postgres, psycopg pool': {'DATABASE_ENGINE': 'postgresql', 'DATABASE_POOL': 'psycopg'},
+}
+
+ENDPOINTS = [
+    ('Project list', '/api/projects/projects/'),
+    ('Task list', '/api/tasks/tasks/'),
+    ('Dashboard', '/api/dashboard/data/'),
+]
+
+
+def start_workers(count):
+    """
+    `count` single-threaded WSGI servers, each on its own port and thread, so
+    a worker keeps its database connection between requests
+    """
+    from django.core.servers.basehttp import WSGIRequestHandler, WSGIServer, get_internal_wsgi_application
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    application = get_internal_wsgi_application()
+    servers = []
+    for _ in range(count):
+        server = WSGIServer(('127.0.0.1', 0), QuietHandler, allow_reuse_address=False)
+        server.set_app(application)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def fetch(port, path, session):
+    request = urllib.request.Request(f'http://127.0.0.1:{port}{path}', headers={'Cookie': f'sessionid={session}'})
+    with urllib.request.urlopen(request) as response:
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f'{path}: HTTP {response.status}')
+
+
+def throughput(servers, path, session, requests):
+    """
+    Requests per second with one client per worker, after a warm-up round
+    """
+    per_client = max(requests // len(servers), 1)
+
+    def client(port):
+        for _ in range(per_client):
+            fetch(port, path, session)
+
+    for server in servers:
+        fetch(server.server_address[1], path, session)
+    threads = [threading.Thread(target=client, args=(server.server_address[1],)) for server in servers]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return per_client * len(servers) / (time.perf_counter() - start)
+
+
+def run_profile(args):
+    """
+    Benchmark the profile selected by the environment; prints one JSON line
+    """
+    import django
+    from django.core.exceptions import ImproperlyConfigured
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_tracker.settings')
+    try:
+        django.setup()
+    except ImproperlyConfigured as exc:
+        # e.g. the psycopg pool profile without psycopg 3 installed
+        print(json.dumps({'skipped': str(exc)}))
+        return 0
+
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import Client, override_settings
+
+    from benchmark_list_serialization import populate
+
+    # Measure the database, not the caches; DEBUG would also log every query
+    override_settings(
+        DEBUG=False, ALLOWED_HOSTS=['127.0.0.1'], RESPONSE_CACHE_TIMEOUT=0, SNAPSHOT_CACHE_TIMEOUT=0,
+    ).enable()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if connection.vendor == 'sqlite':
+            # The default in-memory test database would flatter SQLite
+            connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'benchmark.sqlite3')
+        try:
+            old_name = connection.creation.create_test_db(verbosity=0)
+        except Exception as exc:
+            print(json.dumps({'skipped': f'{type(exc).__name__}: {exc}'.splitlines()[0]}))
+            return 0
+        try:
+            populate(args.rows)
+            client = Client()
+            client.force_login(User.objects.create_user('benchmark', password='benchmark-pass'))
+            session = client.cookies['sessionid'].value
+            connection.close()
+
+            servers = start_workers(args.workers)
+            results = {label: throughput(servers, path, session, args.requests) for label, path in ENDPOINTS}
+            for server in servers:
+                server.shutdown()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+    print(json.dumps(results))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=400, help='per endpoint')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--profile', choices=sorted(PROFILES), action='append',
+                        help='run only these profiles (repeatable)')
+    parser.add_argument('--run-profile', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run_profile:
+        return run_profile(args)
+
+    print(f"📊 {args.rows} projects and tasks, {args.requests} requests per endpoint, {args.workers} workers\n")
+    print(f"{'':<32}" + ''.join(f"{label:>16}" for label, _ in ENDPOINTS))
+    baseline = None
+    for name in args.profile or PROFILES:
+        command = [sys.executable, os.path.abspath(__file__), '--run-profile',
+                   '--rows', str(args.rows), '--requests', str(args.requests), '--workers', str(args.workers)]
+        completed = subprocess.run(
+            command, env={**os.environ, **PROFILES[name]}, capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        if completed.returncode:
+            print(f"{name:<32}❌ failed\n{completed.stderr}")
+            return 1
+        results = json.loads(completed.stdout.strip().splitlines()[-1])
+        if 'skipped' in results:
+            print(f"{name:<32}⏭️  skipped ({results['skipped']})")
+            continue
+        baseline = baseline or results
+        cells = [
+            f"{results[label]:.0f} req/s" if results is baseline else
+            f"{results[label]:.0f} ({results[label] / baseline[label]:.1f}x)"
+            for label, _ in ENDPOINTS
+        ]
+        print(f"{name:<32}" + ''.join(f"{cell:>16}" for cell in cells))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Benchmark the regular DRF serializer path against the FastListMixin path
+for 10k-row task and project pages.
+
+Runs against a throwaway test database:
+    python benchmark_list_serialization.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_tracker.settings')
+django.setup()
+
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from projects.rollups import rebuild_task_rollups
+from projects.views import ProjectViewSet
+from tasks.models import Task
+from tasks.views import TaskViewSet
+
+
+def populate(rows):
+    projects = Project.objects.bulk_create([
+        Project(name=f'Project {i}', description='Benchmark project ' * 10,
+                start_date=date(2025, 1, 1) + timedelta(days=i % 90),
+                estimated_completion_date=date(2025, 6, 1) + timedelta(days=i % 120),
+                budget='25000.00')
+        for i in range(rows)
+    ], batch_size=1000)
+    Task.objects.bulk_create([
+        Task(title=f'Task {i}', description='Benchmark task ' * 10,
+             project=projects[i % len(projects)],
+             status=['TODO', 'IN_PROGRESS', 'REVIEW', 'COMPLETED', 'BLOCKED'][i % 5],
+             priority=['LOW', 'MEDIUM', 'HIGH', 'CRITICAL'][i % 4],
+             due_date=date(2025, 3, 1) + timedelta(days=i % 200),
+             estimated_hours='8.00', actual_hours='2.50')
+        for i in range(rows)
+    ], batch_size=1000)
+    rebuild_task_rollups()
+
+
+def measure(client, url, viewset, fast, repeat):
+    timings = []
+    body = None
+    with mock.patch.object(viewset, 'fast_list', fast):
+        for _ in range(repeat):
+            cache.clear()
+            start = time.perf_counter()
+            body = client.get(url).content
+            timings.append(time.perf_counter() - start)
+    return min(timings), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(args.rows)
+        client = APIClient()
+        print(f"📊 {args.rows} rows per page, best of {args.repeat}\n")
+        endpoints = [
+            ('Tasks', '/api/tasks/tasks/', TaskViewSet),
+            ('Projects', '/api/projects/projects/', ProjectViewSet),
+        ]
+        for label, url, viewset in endpoints:
+            with mock.patch.object(PageNumberPagination, 'page_size', args.rows):
+                slow, slow_body = measure(client, url, viewset, False, args.repeat)
+                fast, fast_body = measure(client, url, viewset, True, args.repeat)
+            identical = '✅ identical' if slow_body == fast_body else '❌ DIFFERENT'
+            print(f"{label:<9} serializer {slow * 1000:8.1f} ms | fast path {fast * 1000:8.1f} ms "
+                  f"| {slow / fast:4.1f}x | output {identical}")
+            if slow_body != fast_body:
+                return 1
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
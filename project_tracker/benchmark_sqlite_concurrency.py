@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+Concurrent read/write benchmark for SQLite, default settings against
+SQLITE_PERFORMANCE_MODE (WAL, tuned PRAGMAs, immediate transactions).
+
+Reader and writer processes, like gunicorn workers, share one database
+file for a fixed time; readers page through tasks, writers load a project
+then create and complete a task in it through the ORM (signals, rollups
+and activity included):
+    python benchmark_sqlite_concurrency.py [--rows 5000] [--readers 4] [--writers 2] [--seconds 10]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+MODES = {
+    'default': {},
+    'performance mode': {'SQLITE_PERFORMANCE_MODE': '1'},
+}
+
+
+def setup_django(environ):
+    os.environ.update(environ)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_tracker.settings')
+    import django
+    django.setup()
+
+
+def prepare(environ, rows):
+    """
+    Migrate and populate a fresh database file
+    """
+    setup_django(environ)
+    from django.core.management import call_command
+    from benchmark_list_serialization import populate
+
+    call_command('migrate', verbosity=0)
+    populate(rows)
+
+
+def reader(environ, seconds, results):
+    setup_django(environ)
+    from django.db import OperationalError
+    from tasks.models import Task
+
+    statuses = Task.Status.values
+    done = locked = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            status = statuses[done % len(statuses)]
+            queryset = Task.objects.filter(status=status).select_related('project').order_by('-created_at', '-id')
+            list(queryset[:50])
+            queryset.count()
+            done += 1
+        except OperationalError:
+            locked += 1
+    results.put(('read', done, locked, []))
+
+
+def writer(environ, seconds, results):
+    setup_django(environ)
+    from django.db import OperationalError, transaction
+    from projects.models import Project
+    from tasks.models import Task
+
+    project_ids = list(Project.objects.values_list('id', flat=True)[:100])
+    done = locked = 0
+    latencies = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                # Read before writing, as a view validating its input does
+                project = Project.objects.get(pk=project_ids[done % len(project_ids)])
+                task = Task.objects.create(title=f'Benchmark {done}', project=project)
+                task.status = Task.Status.COMPLETED
+                task.save()
+            done += 1
+            latencies.append(time.perf_counter() - start)
+        except OperationalError:
+            locked += 1
+    results.put(('write', done, locked, latencies))
+
+
+def run_mode(environ, args):
+    context = multiprocessing.get_context('spawn')
+    preparing = context.Process(target=prepare, args=(environ, args.rows))
+    preparing.start()
+    preparing.join()
+    if preparing.exitcode:
+        raise RuntimeError('populating the database failed')
+
+    results = context.Queue()
+    workers = (
+        [context.Process(target=reader, args=(environ, args.seconds, results)) for _ in range(args.readers)]
+        + [context.Process(target=writer, args=(environ, args.seconds, results)) for _ in range(args.writers)]
+    )
+    for worker in workers:
+        worker.start()
+    totals = {'read': 0, 'write': 0, 'locked': 0}
+    latencies = []
+    for _ in workers:
+        kind, done, locked, timings = results.get()
+        totals[kind] += done
+        totals['locked'] += locked
+        latencies.extend(timings)
+    for worker in workers:
+        worker.join()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0
+    return totals['read'] / args.seconds, totals['write'] / args.seconds, p95, totals['locked']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"📊 {args.readers} readers + {args.writers} writers for {args.seconds:g}s over {args.rows} tasks\n")
+    print(f"{'':<18}{'reads/s':>10}{'writes/s':>10}{'p95 write':>12}{'locked':>8}")
+    baseline = None
+    for name, overrides in MODES.items():
+        with tempfile.TemporaryDirectory() as directory:
+            environ = {
+                'DATABASE_ENGINE': 'sqlite',
+                'SQLITE_PATH': os.path.join(directory, 'benchmark.sqlite3'),
+                **overrides,
+            }
+            reads, writes, p95, locked = run_mode(environ, args)
+        print(f"{name:<18}{reads:>10.0f}{writes:>10.0f}{p95 * 1000:>9.1f} ms{locked:>8}")
+        if baseline is None:
+            baseline = (reads, writes)
+        else:
+            print(f"\n{'gain':<18}{reads / max(baseline[0], 1e-9):>9.1f}x{writes / max(baseline[1], 1e-9):>9.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
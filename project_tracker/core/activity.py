@@ -0,0 +1,96 @@
+# core/activity.py
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import bump_data_version_on_commit
+from .models import ActivityEvent
+
+DEFAULT_FEED_SIZE = 5
+MAX_FEED_SIZE = 50
+
+
+def encode_cursor(event):
+    raw = f'{event.created_at.isoformat()}|{event.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Turn an opaque feed cursor back into (created_at, id); raises ValueError
+    """
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+    except (UnicodeError, ValueError, TypeError) as exc:
+        raise ValueError('Invalid cursor') from exc
+
+
+def feed_page(cursor=None, limit=DEFAULT_FEED_SIZE):
+    """
+    One page of the activity feed, newest first, as a single range scan over
+    the (created_at, id) index. Returns (events, next_cursor).
+    """
+    queryset = ActivityEvent.objects.order_by('-created_at', '-id')
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+    events = list(queryset[:limit + 1])
+    next_cursor = encode_cursor(events[limit - 1]) if len(events) > limit else None
+    return events[:limit], next_cursor
+
+
+def event_for(kind, instance, project_name='', detail=''):
+    return ActivityEvent(
+        kind=kind,
+        object_id=instance.pk,
+        subject=str(instance)[:200],
+        project_name=project_name[:200],
+        detail=detail[:200],
+    )
+
+
+def record(kind, instance, project_name='', detail=''):
+    event = event_for(kind, instance, project_name, detail)
+    event.save()
+    return event
+
+
+def record_many(events):
+    """
+    Write a batch of unsaved events built with `event_for`
+    """
+    return ActivityEvent.objects.bulk_create(events, batch_size=1000)
+
+
+def record_overdue_tasks(today=None):
+    """
+    Log a TASK_OVERDUE event for every open task that has passed its due date
+    and has not been logged yet. Returns the number of events written.
+    """
+    from tasks.models import Task
+
+    today = today or timezone.now().date()
+    already_logged = ActivityEvent.objects.filter(kind=ActivityEvent.Kind.TASK_OVERDUE).values('object_id')
+    overdue = (
+        Task.objects.filter(due_date__lt=today, status__in=['TODO', 'IN_PROGRESS', 'REVIEW', 'BLOCKED'])
+        .exclude(id__in=already_logged)
+        .values_list('id', 'title', 'project__name', 'due_date')
+    )
+    created = ActivityEvent.objects.bulk_create((
+        ActivityEvent(
+            kind=ActivityEvent.Kind.TASK_OVERDUE,
+            object_id=pk,
+            subject=title,
+            project_name=project_name,
+            detail=str(due_date),
+        ) for pk, title, project_name, due_date in overdue.iterator(chunk_size=2000)
+    ), batch_size=1000)
+    if created:
+        # The feed is served with data-version ETags
+        bump_data_version_on_commit()
+    return len(created)
@@ -1,3 +1,11 @@
 from django.contrib import admin
+from .models import ActivityEvent
 
 # Register your models here.
+class ActivityEventAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'subject', 'project_name', 'created_at')
+    list_filter = ('kind',)
+    search_fields = ('subject', 'project_name')
+
+
+admin.site.register(ActivityEvent, ActivityEventAdmin)
@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .search import ensure_search_indexes
+        post_migrate.connect(ensure_search_indexes, sender=self, dispatch_uid='core-search-indexes')
+
+        from project_tracker.database import apply_pragmas
+        connection_created.connect(apply_pragmas, dispatch_uid='core-sqlite-pragmas')
@@ -0,0 +1,187 @@
+# core/cache.py
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+DATA_VERSION_KEY = 'core:data-version'
+GENERATION_KEY = 'core:generation:{}'
+RESPONSE_STATS_KEY = 'core:response-cache:{}:{}'
+
+
+def shared_cache(alias='default'):
+    """
+    Whether every worker process reads the same cache; local-memory (and
+    dummy) caches are private to the process writing them
+    """
+    return not isinstance(caches[alias], (LocMemCache, DummyCache))
+
+
+def _seed_version():
+    # Seeding from the clock keeps versions monotonic even if the counter is
+    # evicted, so an old snapshot can never be served under a reused number
+    return time.time_ns() // 1000
+
+
+def get_counter(key, using=cache):
+    value = using.get(key)
+    if value is None:
+        using.add(key, _seed_version(), timeout=None)
+        value = using.get(key)
+    return value
+
+
+def bump_counter(key, using=cache):
+    try:
+        return using.incr(key)
+    except ValueError:
+        value = _seed_version()
+        using.set(key, value, timeout=None)
+        return value
+
+
+def get_data_version():
+    """
+    Current global data version, shared by every process using the cache
+    """
+    return get_counter(DATA_VERSION_KEY)
+
+
+def bump_data_version():
+    """
+    Invalidate every snapshot built against the previous data version
+    """
+    return bump_counter(DATA_VERSION_KEY)
+
+
+def bump_data_version_on_commit(**kwargs):
+    """
+    Signal receiver; waits for the surrounding transaction so readers never
+    cache pre-commit data under the new version
+    """
+    transaction.on_commit(bump_data_version)
+
+
+def get_snapshot(name, builder, *parts, timeout=None):
+    """
+    Return the cached value of `builder()` for the current data version,
+    building and storing it on a miss
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'SNAPSHOT_CACHE_TIMEOUT', 300)
+    key = ':'.join(['core:snapshot', name, str(get_data_version()), *map(str, parts)])
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, timeout=timeout)
+    return value
+
+
+def data_etag(request, *args, **kwargs):
+    """
+    ETag for responses derived only from project/task data. The date covers
+    overdue flags, and the snapshot window bounds staleness when workers do
+    not share a cache.
+    """
+    window = int(time.time() // max(getattr(settings, 'SNAPSHOT_CACHE_TIMEOUT', 300), 1))
+    return f'{get_data_version()}.{timezone.now().date().isoformat()}.{window}'
+
+
+def conditional_on_data_version(view_func):
+    """
+    Answer If-None-Match with 304 before the view does any work, and ask
+    clients to revalidate instead of reusing a stored copy blindly
+    """
+    conditional_view = condition(etag_func=data_etag)(view_func)
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        response = conditional_view(request, *args, **kwargs)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+    return wrapper
+
+
+def response_cache():
+    """
+    Cache holding viewset responses and the per-model generation counters
+    """
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def get_generations(model_names):
+    """
+    Current generation of each model, seeding the ones not seen yet
+    """
+    store = response_cache()
+    keys = {name: GENERATION_KEY.format(name) for name in model_names}
+    found = store.get_many(keys.values())
+    return {name: found.get(key) or get_counter(key, store) for name, key in keys.items()}
+
+
+def bump_generation(model_name):
+    """
+    Make every cached response that read `model_name` unreachable
+    """
+    return bump_counter(GENERATION_KEY.format(model_name), response_cache())
+
+
+def normalized_query(request):
+    # Parameter order and repetition order do not change the response
+    params = sorted((key, value) for key in request.GET for value in request.GET.getlist(key))
+    return urlencode(params)
+
+
+def response_cache_key(name, action, dependencies, request, pk=None):
+    generations = get_generations(dependencies)
+    parts = [
+        request.build_absolute_uri(request.path),  # pagination links are absolute
+        normalized_query(request),
+        str(pk),
+        timezone.now().date().isoformat(),  # overdue flags
+        *(f'{model}={generations[model]}' for model in dependencies),
+    ]
+    digest = hashlib.md5('|'.join(parts).encode()).hexdigest()
+    return f'core:response:{name}:{action}:{digest}'
+
+
+def increment(key, delta=1, using=cache):
+    """
+    Add `delta` to a persistent statistics counter, creating it at zero
+    """
+    try:
+        return using.incr(key, delta)
+    except ValueError:
+        using.add(key, 0, timeout=None)
+        return using.incr(key, delta)
+
+
+def count_response_cache(name, outcome):
+    increment(RESPONSE_STATS_KEY.format(name, outcome), using=response_cache())
+
+
+def response_cache_stats(names):
+    """
+    {name: {'hits': n, 'misses': n, 'hit_rate': percent}} for the given cache names
+    """
+    store = response_cache()
+    stats = {}
+    for name in names:
+        hits = store.get(RESPONSE_STATS_KEY.format(name, 'hits'), 0)
+        misses = store.get(RESPONSE_STATS_KEY.format(name, 'misses'), 0)
+        total = hits + misses
+        stats[name] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total * 100, 1) if total else 0,
+        }
+    return stats
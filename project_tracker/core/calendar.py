@@ -0,0 +1,62 @@
+# core/calendar.py
+from django.db.models import Q
+
+from projects.models import Project
+from tasks.models import Task
+
+# Largest window a single calendar request may cover, in days
+MAX_CALENDAR_DAYS = 366
+
+# (event kind, date column) pairs the calendar draws, per model
+PROJECT_MARKERS = [
+    ('project_start', 'start_date'),
+    ('project_due', 'estimated_completion_date'),
+    ('project_end', 'end_date'),
+]
+TASK_MARKERS = [
+    ('task_start', 'start_date'),
+    ('task_due', 'due_date'),
+    ('task_completed', 'completed_date'),
+]
+
+
+def in_window(markers, start, end):
+    # One range per date column, so each side of the OR is an index search
+    condition = Q()
+    for _, column in markers:
+        condition |= Q(**{f'{column}__gte': start, f'{column}__lt': end})
+    return condition
+
+
+def markers_in_window(markers, dates, start, end):
+    for (kind, _), day in zip(markers, dates):
+        if day is not None and start <= day < end:
+            yield kind, day.isoformat()
+
+
+def calendar_events(start, end):
+    """
+    Every project and task date falling in [start, end), as compact events
+    sorted by date. One query per table.
+    """
+    events = []
+    projects = (
+        Project.objects.filter(in_window(PROJECT_MARKERS, start, end))
+        .order_by()
+        .values_list('id', 'name', *(column for _, column in PROJECT_MARKERS))
+    )
+    for pk, name, *dates in projects:
+        for kind, day in markers_in_window(PROJECT_MARKERS, dates, start, end):
+            events.append({'kind': kind, 'id': pk, 'title': name, 'date': day})
+
+    tasks = (
+        Task.objects.filter(in_window(TASK_MARKERS, start, end))
+        .order_by()
+        .values_list('id', 'title', 'project_id', *(column for _, column in TASK_MARKERS))
+    )
+    for pk, title, project_id, *dates in tasks:
+        for kind, day in markers_in_window(TASK_MARKERS, dates, start, end):
+            events.append({'kind': kind, 'id': pk, 'title': title, 'date': day, 'project': project_id})
+
+    events.sort(key=lambda event: event['date'])
+    return events
@@ -0,0 +1,59 @@
+# core/changelog.py
+from datetime import timedelta
+
+from django.db import connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import ChangeLog
+
+# Entries older than this are pruned; sync tokens and report rows older
+# than it start over from a full read
+CHANGELOG_RETENTION = timedelta(days=90)
+
+
+def record_changes(model_name, ids, deleted=False):
+    """
+    Log a batch of written (or deleted) rows. Must run inside the
+    transaction making the change, so the entries commit or roll back with it.
+    """
+    ChangeLog.objects.bulk_create(
+        [ChangeLog(model=model_name, object_id=pk, deleted=deleted) for pk in ids], batch_size=1000,
+    )
+
+
+def committed_position(using='default'):
+    """
+    Highest ChangeLog id such that every entry up to it has committed.
+    Ids are handed out on insert, not on commit: PostgreSQL waits here for
+    the transactions still holding entries (SHARE conflicts with the lock
+    INSERT takes), while SQLite runs a single writer at a time, so its
+    uncommitted entries are always numbered above every committed one.
+    """
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {ChangeLog._meta.db_table} IN SHARE MODE')
+        return ChangeLog.objects.using(using).aggregate(last=Max('id'))['last'] or 0
+
+
+def changes_between(start, end):
+    """
+    (id, model, object_id, deleted) for the entries in (start, end], oldest
+    first
+    """
+    return (
+        ChangeLog.objects.filter(id__gt=start, id__lte=end)
+        .order_by('id')
+        .values_list('id', 'model', 'object_id', 'deleted')
+    )
+
+
+def prune_changes(now=None):
+    """
+    Drop entries past the retention window. Returns the number removed.
+    """
+    now = now or timezone.now()
+    deleted, _ = ChangeLog.objects.filter(changed_at__lt=now - CHANGELOG_RETENTION).delete()
+    return deleted
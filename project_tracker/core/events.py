@@ -0,0 +1,123 @@
+# core/events.py
+import asyncio
+import json
+import threading
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class QueueSubscription:
+    """
+    One subscriber's mailbox, bound to the event loop that reads it
+    """
+    def __init__(self, loop, maxsize=100):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, event):
+        # Runs on the subscriber's loop; a slow client just misses deltas and
+        # still receives the next full dashboard snapshot
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+    async def get(self, timeout=None):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def drain(self):
+        events = []
+        while not self.queue.empty():
+            events.append(self.queue.get_nowait())
+        return events
+
+
+class InProcessBroker:
+    """
+    Fan-out to subscribers living in this process. publish() is thread-safe
+    so it can be called from sync views and signal handlers.
+    """
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # Loop already closed; the subscriber is going away
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self):
+        subscription = QueueSubscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscription)
+
+
+class RedisSubscription:
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    async def get(self, timeout=None):
+        message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        return json.loads(message['data']) if message else None
+
+    async def drain(self):
+        events = []
+        while (event := await self.get(timeout=0)) is not None:
+            events.append(event)
+        return events
+
+
+class RedisBroker:
+    """
+    Fan-out through Redis pub/sub so every worker process sees every write
+    """
+    channel = 'project-tracker:events'
+
+    def __init__(self, url=None):
+        self.url = url or settings.REDIS_URL
+        self._client = None
+
+    def publish(self, event):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url)
+        self._client.publish(self.channel, json.dumps(event))
+
+    @asynccontextmanager
+    async def subscribe(self):
+        import redis.asyncio as aioredis
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self.channel)
+        try:
+            yield RedisSubscription(pubsub)
+        finally:
+            await pubsub.unsubscribe(self.channel)
+            await pubsub.aclose()
+            await client.aclose()
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.EVENT_BROKER)()
+
+
+def publish(event):
+    get_broker().publish(event)
@@ -0,0 +1,104 @@
+# core/fastlist.py
+from rest_framework import fields as drf_fields
+from rest_framework import relations
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .pagination import ordering_of
+
+# Fields whose representation of a database value is the value itself
+PASSTHROUGH_FIELDS = (
+    drf_fields.CharField,
+    drf_fields.ChoiceField,
+    drf_fields.IntegerField,
+    drf_fields.BooleanField,
+    relations.PrimaryKeyRelatedField,
+)
+
+
+def converter_for(field):
+    """
+    Precomputed value -> representation function matching `field`, or None
+    when the field type has no fast equivalent
+    """
+    if isinstance(field, relations.PrimaryKeyRelatedField) and field.pk_field is not None:
+        return None
+    if isinstance(field, PASSTHROUGH_FIELDS):
+        return lambda value: value
+    if isinstance(field, drf_fields.DateField):
+        if getattr(field, 'format', api_settings.DATE_FORMAT) == drf_fields.ISO_8601:
+            return lambda value: value.isoformat()
+        return field.to_representation
+    if isinstance(field, (drf_fields.DateTimeField, drf_fields.DecimalField)):
+        return field.to_representation
+    return None
+
+
+class FastRowBuilder:
+    """
+    Builds serializer-identical rows from `values_list()` tuples, skipping
+    model instantiation and the per-field serializer machinery.
+
+    Plain model fields are handled generically; computed fields need a
+    `fast_<name>()` method on the serializer returning (columns, function).
+    """
+    def __init__(self, plan, columns):
+        self.plan = plan
+        self.columns = columns
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        plan, columns = [], {}
+
+        def column(name):
+            return columns.setdefault(name, len(columns))
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            hook = getattr(serializer, f'fast_{name}', None)
+            if hook is not None:
+                sources, function = hook()
+                plan.append((name, [column(source) for source in sources], function, False))
+                continue
+            if isinstance(field, drf_fields.SerializerMethodField) or field.source == '*':
+                return None
+            convert = converter_for(field)
+            if convert is None:
+                return None
+            plan.append((name, column(field.source.replace('.', '__')), convert, True))
+        return cls(plan, list(columns))
+
+    def build(self, row):
+        result = {}
+        for name, index, function, single in self.plan:
+            if single:
+                value = row[index]
+                result[name] = None if value is None else function(value)
+            else:
+                result[name] = function(*[row[i] for i in index])
+        return result
+
+
+class FastListMixin:
+    """
+    ViewSet mixin serving `list` through FastRowBuilder when the serializer
+    supports it. Output is identical to the regular serializer path.
+    """
+    fast_list = True
+
+    def list(self, request, *args, **kwargs):
+        builder = FastRowBuilder.for_serializer(self.get_serializer()) if self.fast_list else None
+        if builder is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = [name for name, _ in ordering_of(queryset)]
+        # Pagination needs the ordering columns to build cursors
+        columns = list(dict.fromkeys([*builder.columns, *ordering, 'id']))
+        rows = queryset.values_list(*columns)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response([builder.build(row) for row in page])
+        return Response([builder.build(row) for row in rows])
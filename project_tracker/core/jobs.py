@@ -0,0 +1,95 @@
+# core/jobs.py
+import logging
+import time
+
+from celery import Task, states
+from celery.signals import task_postrun, task_prerun
+from django.db import DatabaseError
+from django.db.models import F
+from django.utils import timezone
+
+from .models import JobStat
+
+logger = logging.getLogger(__name__)
+
+JOB_COUNTERS = ('runs', 'succeeded', 'failed', 'retried', 'total_ms')
+
+
+class MeteredTask(Task):
+    """
+    Base class for background jobs. Database errors (lost connection, lock
+    timeout) are retried with jittered exponential backoff; every job is
+    safe to run twice, so messages are acknowledged only once it finishes.
+    Each run records its outcome and duration in JobStat (see job_stats).
+    """
+    autoretry_for = (DatabaseError,)
+    retry_backoff = True
+    retry_backoff_max = 600
+    retry_jitter = True
+    max_retries = 5
+    acks_late = True
+
+
+# task id -> perf_counter() at start, for runs in progress in this process
+_started = {}
+
+OUTCOMES = {states.SUCCESS: 'succeeded', states.FAILURE: 'failed', states.RETRY: 'retried'}
+
+
+@task_prerun.connect
+def start_timer(task_id=None, task=None, **kwargs):
+    if isinstance(task, MeteredTask):
+        _started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def record_run(task_id=None, task=None, state=None, **kwargs):
+    # Eager runs that propagate their error end before task_postrun
+    started = _started.pop(task_id, None)
+    if started is None or state not in OUTCOMES:
+        return
+    elapsed = round((time.perf_counter() - started) * 1000)
+    outcome = OUTCOMES[state]
+    try:
+        JobStat.objects.get_or_create(name=task.name)
+        # Counters move in SQL, so concurrent workers never lose a run
+        JobStat.objects.filter(name=task.name).update(
+            runs=F('runs') + 1,
+            total_ms=F('total_ms') + elapsed,
+            last_ms=elapsed,
+            last_outcome=outcome,
+            last_run=timezone.now(),
+            **{outcome: F(outcome) + 1},
+        )
+    except DatabaseError:
+        # Metrics must not turn a finished job into a failed one
+        logger.exception('Could not record the run of %s', task.name)
+
+
+def metered_jobs(app=None):
+    """
+    Names of every registered MeteredTask, sorted
+    """
+    if app is None:
+        from project_tracker.celery import app
+    # Outside a worker the tasks.py modules have not been imported yet
+    app.loader.import_default_modules()
+    return sorted(name for name, task in app.tasks.items() if isinstance(task, MeteredTask))
+
+
+def job_stats(names):
+    """
+    {name: {runs, succeeded, failed, retried, total_ms, avg_ms, last_ms,
+    last_outcome, last_run}} for the given job names
+    """
+    found = {row.name: row for row in JobStat.objects.filter(name__in=names)}
+    stats = {}
+    for name in names:
+        row = found.get(name, JobStat(name=name))
+        figures = {stat: getattr(row, stat) for stat in JOB_COUNTERS}
+        figures['avg_ms'] = round(row.total_ms / row.runs) if row.runs else 0
+        figures['last_ms'] = row.last_ms
+        figures['last_outcome'] = row.last_outcome or None
+        figures['last_run'] = row.last_run.isoformat() if row.last_run else None
+        stats[name] = figures
+    return stats
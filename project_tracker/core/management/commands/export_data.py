@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import APIException
+
+from core.export import EXPORT_FORMATS, export_chunks, export_viewsets, list_view, write_export
+
+
+class Command(BaseCommand):
+    help = 'Stream projects or tasks to CSV/NDJSON, with the same filters as the list API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(export_viewsets()))
+        parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv', dest='export_format')
+        parser.add_argument('--output', help='File to write (default: stdout)')
+        parser.add_argument(
+            '--query', default='',
+            help='List API query string, e.g. "status=TODO&ordering=due_date&fields=id,title"'
+        )
+
+    def handle(self, *args, **options):
+        view = list_view(export_viewsets()[options['dataset']], options['query'])
+        try:
+            chunks = export_chunks(view, options['export_format'])
+        except APIException as exc:
+            raise CommandError(exc.detail)
+
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        write_export(chunks, options['output'])
+        self.stdout.write(self.style.SUCCESS(f'Exported {options["dataset"]} to {options["output"]}'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.jobs import job_stats, metered_jobs
+
+
+class Command(BaseCommand):
+    help = 'Show run counts and runtimes of the background jobs'
+
+    def handle(self, *args, **options):
+        for name, stats in job_stats(metered_jobs()).items():
+            self.stdout.write(
+                f"{name:<32} runs {stats['runs']:>6}  failed {stats['failed']:>4}  retried {stats['retried']:>4}"
+                f"  avg {stats['avg_ms']:>7} ms  last {stats['last_ms'] or 0:>7} ms"
+                f"  {stats['last_outcome'] or '-'} {stats['last_run'] or ''}"
+            )
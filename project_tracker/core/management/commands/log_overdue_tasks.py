@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.activity import record_overdue_tasks
+
+
+class Command(BaseCommand):
+    help = 'Add newly overdue tasks to the activity feed (run periodically)'
+
+    def handle(self, *args, **options):
+        created = record_overdue_tasks()
+        self.stdout.write(self.style.SUCCESS(f'Logged {created} overdue task(s)'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from project_tracker.database import optimize_database
+
+
+class Command(BaseCommand):
+    help = 'Refresh SQLite planner statistics in SQLITE_PERFORMANCE_MODE (run periodically)'
+
+    def handle(self, *args, **options):
+        statement = optimize_database()
+        if statement is None:
+            self.stdout.write('Not a tuned SQLite database, nothing to do')
+            return
+        self.stdout.write(self.style.SUCCESS(f'Ran {statement}'))
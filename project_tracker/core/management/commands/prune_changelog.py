@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.changelog import prune_changes
+
+
+class Command(BaseCommand):
+    help = 'Delete change log entries older than the retention window (run periodically)'
+
+    def handle(self, *args, **options):
+        deleted = prune_changes()
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} change log entries'))
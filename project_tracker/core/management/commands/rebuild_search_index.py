@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.search import install_search_indexes
+
+
+class Command(BaseCommand):
+    help = 'Recreate the full-text search indexes and repopulate them from the tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        install_search_indexes(connections[options['database']], rebuild=True)
+        self.stdout.write(self.style.SUCCESS('Search indexes rebuilt'))
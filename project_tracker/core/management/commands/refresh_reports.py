@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.reports import refresh_reports
+
+
+class Command(BaseCommand):
+    help = 'Bring the precomputed report rows up to date (run periodically)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute every project, not just changed ones')
+
+    def handle(self, *args, **options):
+        refreshed = refresh_reports(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f'Refreshed report rows for {refreshed} project(s)'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from core.cache import response_cache_stats
+from projects.views import ProjectCategoryViewSet, ProjectViewSet
+from tasks.views import TaskViewSet
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counters of the viewset response cache'
+
+    def handle(self, *args, **options):
+        names = [viewset.get_cache_name() for viewset in (ProjectViewSet, TaskViewSet, ProjectCategoryViewSet)]
+        for name, stats in response_cache_stats(names).items():
+            self.stdout.write(
+                f"{name:<16} hits {stats['hits']:>8}  misses {stats['misses']:>8}  hit rate {stats['hit_rate']:>5}%"
+            )
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:59
+
+from datetime import datetime, time
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_activity(apps, schema_editor):
+    """
+    Seed the log with the creation and completion history of existing rows
+    """
+    ActivityEvent = apps.get_model('core', 'ActivityEvent')
+    Project = apps.get_model('projects', 'Project')
+    Task = apps.get_model('tasks', 'Task')
+    tz = django.utils.timezone.get_current_timezone()
+
+    def events():
+        for project in Project.objects.order_by('pk').iterator(chunk_size=2000):
+            yield ActivityEvent(kind='PROJECT_CREATED', object_id=project.pk,
+                                subject=project.name, created_at=project.created_at)
+            if project.status == 'COMPLETED':
+                yield ActivityEvent(kind='PROJECT_COMPLETED', object_id=project.pk,
+                                    subject=project.name, created_at=project.updated_at)
+        tasks = Task.objects.select_related('project').order_by('pk')
+        for task in tasks.iterator(chunk_size=2000):
+            yield ActivityEvent(kind='TASK_CREATED', object_id=task.pk, subject=task.title,
+                                project_name=task.project.name, created_at=task.created_at)
+            if task.status == 'COMPLETED':
+                completed_at = (datetime.combine(task.completed_date, time.min, tzinfo=tz)
+                                if task.completed_date else task.updated_at)
+                yield ActivityEvent(kind='TASK_COMPLETED', object_id=task.pk, subject=task.title,
+                                    project_name=task.project.name, created_at=completed_at)
+
+    batch = []
+    for event in events():
+        batch.append(event)
+        if len(batch) >= 2000:
+            ActivityEvent.objects.bulk_create(batch)
+            batch = []
+    ActivityEvent.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('projects', '0006_project_task_rollup'),
+        ('tasks', '0004_remove_task_owner'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('PROJECT_CREATED', 'Project created'), ('PROJECT_COMPLETED', 'Project completed'), ('TASK_CREATED', 'Task created'), ('TASK_COMPLETED', 'Task completed'), ('TASK_OVERDUE', 'Task overdue')], max_length=30)),
+                ('object_id', models.BigIntegerField()),
+                ('subject', models.CharField(max_length=200)),
+                ('project_name', models.CharField(blank=True, max_length=200)),
+                ('detail', models.CharField(blank=True, max_length=200)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='activity_feed_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_activity, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:10
+
+from django.db import migrations
+
+# Frozen copy of the DDL in core.search at the time of this migration, so
+# later changes there do not rewrite history. core.search reinstalls the
+# current version after every migrate.
+SQLITE_INSTALL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS projects_project_fts USING fts5(name, description, "
+    "content='projects_project', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS projects_project_fts_ai AFTER INSERT ON projects_project BEGIN "
+    "INSERT INTO projects_project_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS projects_project_fts_ad AFTER DELETE ON projects_project BEGIN "
+    "INSERT INTO projects_project_fts(projects_project_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS projects_project_fts_au AFTER UPDATE OF name, description ON projects_project BEGIN "
+    "INSERT INTO projects_project_fts(projects_project_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO projects_project_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+    "INSERT INTO projects_project_fts(projects_project_fts) VALUES ('rebuild')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_task_fts USING fts5(title, description, "
+    "content='tasks_task', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ai AFTER INSERT ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ad AFTER DELETE ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_task_fts_au AFTER UPDATE OF title, description ON tasks_task BEGIN "
+    "INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS projects_project_fts_ai',
+    'DROP TRIGGER IF EXISTS projects_project_fts_ad',
+    'DROP TRIGGER IF EXISTS projects_project_fts_au',
+    'DROP TABLE IF EXISTS projects_project_fts',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_ai',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_ad',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_au',
+    'DROP TABLE IF EXISTS tasks_task_fts',
+]
+
+POSTGRES_INSTALL = [
+    "ALTER TABLE projects_project ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED",
+    'CREATE INDEX IF NOT EXISTS projects_project_search_idx ON projects_project USING GIN (search_vector)',
+    "ALTER TABLE tasks_task ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED",
+    'CREATE INDEX IF NOT EXISTS tasks_task_search_idx ON tasks_task USING GIN (search_vector)',
+]
+
+POSTGRES_DROP = [
+    'DROP INDEX IF EXISTS projects_project_search_idx',
+    'ALTER TABLE projects_project DROP COLUMN IF EXISTS search_vector',
+    'DROP INDEX IF EXISTS tasks_task_search_idx',
+    'ALTER TABLE tasks_task DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement, params=None)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_activity_event'),
+        ('projects', '0007_project_project_created_keyset_idx_and_more'),
+        ('tasks', '0005_task_task_created_keyset_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_INSTALL, 'postgresql': POSTGRES_INSTALL}),
+            run({'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP}),
+        ),
+    ]
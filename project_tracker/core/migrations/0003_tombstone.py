@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:18
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_fulltext_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=50)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['deleted_at', 'id'],
+                'indexes': [models.Index(fields=['deleted_at', 'id'], name='tombstone_sync_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:29
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_tombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report', models.CharField(choices=[('PROJECT', 'Project'), ('CATEGORY', 'Category'), ('PRIORITY', 'Task priority'), ('STATUS', 'Task status'), ('TOTAL', 'Total')], max_length=20)),
+                ('key', models.CharField(max_length=50)),
+                ('label', models.CharField(max_length=200)),
+                ('data', models.JSONField(default=dict)),
+                ('refreshed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['report', 'key'],
+                'constraints': [models.UniqueConstraint(fields=('report', 'key'), name='report_row_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_report_rows'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=50)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('changed_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.DeleteModel(
+            name='Tombstone',
+        ),
+        migrations.AddField(
+            model_name='reportrow',
+            name='changes_applied',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
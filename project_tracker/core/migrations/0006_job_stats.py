@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_changelog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, unique=True)),
+                ('runs', models.PositiveIntegerField(default=0)),
+                ('succeeded', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('retried', models.PositiveIntegerField(default=0)),
+                ('total_ms', models.BigIntegerField(default=0)),
+                ('last_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('last_outcome', models.CharField(blank=True, max_length=20)),
+                ('last_run', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+    ]
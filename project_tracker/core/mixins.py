@@ -0,0 +1,81 @@
+# core/mixins.py
+from django.conf import settings
+from django.utils.decorators import method_decorator
+from rest_framework.response import Response
+
+from .cache import conditional_on_data_version, count_response_cache, response_cache, response_cache_key
+from .pagination import KeysetPagination
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin answering unchanged list/retrieve polls with 304 Not Modified
+    """
+    @method_decorator(conditional_on_data_version)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @method_decorator(conditional_on_data_version)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+
+class ResponseCacheMixin:
+    """
+    ViewSet mixin caching JSON list/retrieve responses. Entries are keyed on
+    the normalized query string and the generation of every model named in
+    `cache_dependencies`; a save or delete of any of them bumps its
+    generation, so only the affected viewsets miss afterwards.
+    """
+    cache_name = None
+    cache_dependencies = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response('list', super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response('retrieve', super().retrieve, request, *args, **kwargs)
+
+    @classmethod
+    def get_cache_name(cls):
+        return cls.cache_name or cls.queryset.model._meta.model_name
+
+    def cached_response(self, action, handler, request, *args, **kwargs):
+        timeout = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+        # The browsable API embeds per-user markup, so only JSON is shared
+        if not timeout or request.accepted_renderer.format != 'json':
+            return handler(request, *args, **kwargs)
+
+        name = self.get_cache_name()
+        pk = kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        key = response_cache_key(name, action, self.cache_dependencies, request, pk)
+        store = response_cache()
+        data = store.get(key)
+        if data is not None:
+            count_response_cache(name, 'hits')
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        count_response_cache(name, 'misses')
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            store.set(key, response.data, timeout=timeout)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class KeysetPaginationMixin:
+    """
+    ViewSet mixin switching list pagination to KeysetPagination when the
+    request carries a `cursor` parameter (pass `?cursor=` for the first page)
+    """
+    keyset_pagination_class = KeysetPagination
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.keyset_pagination_class.cursor_query_param not in self.request.query_params:
+                return super().paginator
+            self._paginator = self.keyset_pagination_class()
+        return self._paginator
@@ -1,3 +1,107 @@
 from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+
+class ActivityEvent(models.Model):
+    """
+    Append-only log of project and task lifecycle events, read newest first
+    """
+    class Kind(models.TextChoices):
+        PROJECT_CREATED = 'PROJECT_CREATED', _('Project created')
+        PROJECT_COMPLETED = 'PROJECT_COMPLETED', _('Project completed')
+        TASK_CREATED = 'TASK_CREATED', _('Task created')
+        TASK_COMPLETED = 'TASK_COMPLETED', _('Task completed')
+        TASK_OVERDUE = 'TASK_OVERDUE', _('Task overdue')
+
+    kind = models.CharField(max_length=30, choices=Kind.choices)
+
+    # Subject, denormalized so the feed never joins back to projects/tasks
+    object_id = models.BigIntegerField()
+    subject = models.CharField(max_length=200)
+    project_name = models.CharField(max_length=200, blank=True)
+    detail = models.CharField(max_length=200, blank=True)
+
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.subject}"
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='activity_feed_idx'),
+        ]
+
+
+class ChangeLog(models.Model):
+    """
+    Projects, categories and tasks written or deleted, one entry per write,
+    logged in the writing transaction. Delta sync and the report refresh
+    read it by id, which readers only advance to once every lower entry has
+    committed (core.changelog.committed_position).
+    """
+    model = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id} {'deleted' if self.deleted else 'changed'}"
+
+    class Meta:
+        ordering = ['id']
+
+
+class ReportRow(models.Model):
+    """
+    Precomputed report figures, one row per project and per group, rebuilt
+    in the background by core.reports.refresh_reports
+    """
+    class Report(models.TextChoices):
+        PROJECT = 'PROJECT', _('Project')
+        CATEGORY = 'CATEGORY', _('Category')
+        PRIORITY = 'PRIORITY', _('Task priority')
+        STATUS = 'STATUS', _('Task status')
+        TOTAL = 'TOTAL', _('Total')
+
+    report = models.CharField(max_length=20, choices=Report.choices)
+    key = models.CharField(max_length=50)
+    label = models.CharField(max_length=200)
+    data = models.JSONField(default=dict)
+
+    refreshed_at = models.DateTimeField(default=timezone.now)
+    # ChangeLog id up to which every change has been applied
+    changes_applied = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.get_report_display()}: {self.label}"
+
+    class Meta:
+        ordering = ['report', 'key']
+        constraints = [
+            models.UniqueConstraint(fields=['report', 'key'], name='report_row_unique'),
+        ]
+
+
+class JobStat(models.Model):
+    """
+    Run counts and timings of one background job, written by core.jobs from
+    whichever process ran it, so every worker and web process reads the same
+    figures
+    """
+    name = models.CharField(max_length=200, unique=True)
+    runs = models.PositiveIntegerField(default=0)
+    succeeded = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    retried = models.PositiveIntegerField(default=0)
+    total_ms = models.BigIntegerField(default=0)
+    last_ms = models.PositiveIntegerField(null=True, blank=True)
+    last_outcome = models.CharField(max_length=20, blank=True)
+    last_run = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.runs} run(s)"
+
+    class Meta:
+        ordering = ['name']
@@ -0,0 +1,155 @@
+# core/pagination.py
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import F, OrderBy, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def ordering_of(queryset):
+    """
+    (name, descending) pairs of the queryset ordering, id excluded. F()
+    orderings, such as the full-text search rank, count by their name.
+    """
+    ordering = []
+    for item in queryset.query.order_by or queryset.model._meta.ordering:
+        if isinstance(item, str):
+            name, descending = item.lstrip('-'), item.startswith('-')
+        elif isinstance(item, OrderBy) and isinstance(item.expression, F):
+            name, descending = item.expression.name, item.descending
+        else:
+            continue
+        if name not in ('pk', 'id'):
+            ordering.append((name, descending))
+    return ordering
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over (ordering fields..., id). Every page is a single
+    indexed range scan, so page 10,000 costs the same as page 1 and no
+    COUNT(*) is issued. NULLs always sort last.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_ordering(self, queryset):
+        return ordering_of(queryset)
+
+    def get_fields(self, queryset, ordering):
+        fields = []
+        for name, _ in ordering:
+            annotation = queryset.query.annotations.get(name)
+            if annotation is not None:
+                # e.g. the search rank: keyed on like a column of its output type
+                field = annotation.output_field.clone()
+                field.set_attributes_from_name(name)
+            else:
+                try:
+                    field = queryset.model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    # Ordering across relations is not keyset-able
+                    raise NotFound(self.invalid_cursor_message)
+            fields.append(field)
+        return fields
+
+    def order_expressions(self, ordering, fields):
+        expressions = []
+        for (name, descending), field in zip(ordering, fields):
+            expression = F(name).desc if descending else F(name).asc
+            expressions.append(expression(nulls_last=True) if field.null else expression())
+        id_descending = ordering[-1][1] if ordering else False
+        expressions.append(F('id').desc() if id_descending else F('id').asc())
+        return expressions
+
+    def after(self, ordering, fields, values, last_id):
+        """
+        Rows strictly after the cursor position in the (fields..., id) order
+        """
+        id_descending = ordering[-1][1] if ordering else False
+        condition = Q(id__lt=last_id) if id_descending else Q(id__gt=last_id)
+        for (name, descending), field, value in reversed(list(zip(ordering, fields, values))):
+            if value is None:
+                condition = Q(**{f'{name}__isnull': True}) & condition
+            else:
+                beyond = Q(**{f'{name}__lt' if descending else f'{name}__gt': value})
+                if field.null:
+                    beyond |= Q(**{f'{name}__isnull': True})
+                condition = beyond | (Q(**{name: value}) & condition)
+        return condition
+
+    def row_value(self, row, name):
+        # Rows are model instances, or tuples from the values_list() fast path
+        if isinstance(row, tuple):
+            return row[self.row_index[name]]
+        return getattr(row, name)
+
+    def encode_cursor(self, fields, row):
+        position = []
+        for field in fields:
+            value = self.row_value(row, field.attname)
+            position.append(None if value is None else
+                            value.isoformat() if hasattr(value, 'isoformat') else str(value))
+        raw = json.dumps([position, self.row_value(row, 'id')]).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def decode_cursor(self, cursor, fields):
+        try:
+            position, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if len(position) != len(fields):
+                raise ValueError
+            values = [None if value is None else field.to_python(value)
+                      for field, value in zip(fields, position)]
+            return values, int(last_id)
+        except (TypeError, ValueError, UnicodeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        ordering = self.get_ordering(queryset)
+        self.fields = self.get_fields(queryset, ordering)
+        self.row_index = {name: i for i, name in enumerate(queryset._fields or ())}
+        loaded, deferring = queryset.query.deferred_loading
+        if loaded and not deferring and not queryset._fields:
+            # Sparse fieldsets: the cursor still needs the ordering columns
+            columns = [name for name, _ in ordering if name not in queryset.query.annotations]
+            queryset = queryset.only(*loaded, *columns)
+        queryset = queryset.order_by(*self.order_expressions(ordering, self.fields))
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            values, last_id = self.decode_cursor(cursor, self.fields)
+            queryset = queryset.filter(self.after(ordering, self.fields, values, last_id))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.fields, self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,75 @@
+# core/queryplan.py
+import re
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def explain(sql, params=()):
+    """
+    Query plan of `sql` as a list of lines. On Postgres sequential scans are
+    disabled first, so tiny test tables still show the index the planner
+    would pick for a large one.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN {sql}', params)
+            return [row[0] for row in cursor.fetchall()]
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def queryset_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    return explain(sql, params)
+
+
+def full_scans(plan, table):
+    """
+    Plan lines reading every row of `table`, from the table itself or by
+    walking a whole index
+    """
+    if connection.vendor == 'postgresql':
+        pattern = re.compile(rf'Seq Scan on {table}\b')
+    else:
+        # SEARCH is a bounded index lookup; SCAN, even "USING INDEX", is not
+        pattern = re.compile(rf'\bSCAN {table}\b')
+    return [line for line in plan if pattern.search(line)]
+
+
+def sorts(plan):
+    """
+    Plan lines sorting rows instead of reading them in index order
+    """
+    if connection.vendor == 'postgresql':
+        return [line for line in plan if re.search(r'\bSort\b', line) and 'Sort Key' not in line]
+    return [line for line in plan if 'USE TEMP B-TREE FOR ORDER BY' in line]
+
+
+class QueryPlanAssertions:
+    """
+    TestCase mixin asserting the hot queries stay on indexes
+    """
+    def assertPlanIndexed(self, plan, table, ordered=False):
+        scans = full_scans(plan, table)
+        self.assertFalse(scans, f'Full scan of {table}:\n' + '\n'.join(plan))
+        if ordered:
+            self.assertFalse(sorts(plan), 'Sort instead of index order:\n' + '\n'.join(plan))
+
+    def assertQuerysetIndexed(self, queryset, ordered=False):
+        self.assertPlanIndexed(queryset_plan(queryset), queryset.model._meta.db_table, ordered)
+
+    def assertRequestIndexed(self, path, params, table, ordered=False):
+        """
+        Issue a GET and check the plan of every query it ran against `table`
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        queries = [q['sql'] for q in context.captured_queries
+                   if q['sql'].startswith('SELECT') and f'"{table}"' in q['sql']]
+        self.assertTrue(queries, f'No query against {table} for {path} {params}')
+        for sql in queries:
+            # Only the row query is ordered; COUNT(*) just needs an index
+            self.assertPlanIndexed(explain(sql), table, ordered and 'ORDER BY' in sql)
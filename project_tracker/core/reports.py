@@ -0,0 +1,244 @@
+# core/reports.py
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from projects.models import Project, ProjectCategory
+from tasks.models import Task
+from .changelog import CHANGELOG_RETENTION, changes_between, committed_position
+from .models import ReportRow
+from .stats import completion_rate
+
+Report = ReportRow.Report
+
+# Rows summed from the PROJECT rows on every refresh
+GROUP_REPORTS = [Report.CATEGORY, Report.PRIORITY, Report.STATUS, Report.TOTAL]
+
+TOTAL_KEY = 'all'
+UNCATEGORIZED = 'none'
+
+
+def project_rows(project_ids=None):
+    """
+    {project id: PROJECT row data} for `project_ids`, or every project when
+    None: budget and spend from the project, hours and task counts (also
+    per status and priority) from one grouped query over its tasks
+    """
+    projects = Project.objects.order_by()
+    tasks = Task.objects.order_by()
+    if project_ids is not None:
+        projects = projects.filter(pk__in=project_ids)
+        tasks = tasks.filter(project_id__in=project_ids)
+
+    rows = {}
+    columns = ('id', 'name', 'category_id', 'status', 'priority', 'budget', 'current_spend')
+    for pk, name, category_id, status, priority, budget, spend in projects.values_list(*columns):
+        rows[pk] = {
+            'name': name,
+            'category': category_id,
+            'status': status,
+            'priority': priority,
+            'budget': None if budget is None else float(budget),
+            'current_spend': float(spend),
+            'estimated_hours': 0.0,
+            'actual_hours': 0.0,
+            'task_counts': {},
+        }
+
+    grouped = tasks.values('project_id', 'status', 'priority').annotate(
+        count=Count('id'),
+        estimated=Sum('estimated_hours'),
+        actual=Sum('actual_hours'),
+    )
+    for group in grouped:
+        data = rows.get(group['project_id'])
+        if data is None:
+            continue  # project created between the two queries; next refresh
+        data['estimated_hours'] += float(group['estimated'] or 0)
+        data['actual_hours'] += float(group['actual'] or 0)
+        data['task_counts'].setdefault(group['status'], {})[group['priority']] = group['count']
+
+    for data in rows.values():
+        data['tasks'], data['completed_tasks'] = task_totals(data['task_counts'])
+        data['estimated_hours'] = round(data['estimated_hours'], 2)
+        data['actual_hours'] = round(data['actual_hours'], 2)
+        data['budget_used'] = budget_used(data['current_spend'], data['budget'])
+        data['hours_variance'] = round(data['actual_hours'] - data['estimated_hours'], 2)
+        data['completion_rate'] = completion_rate(data['completed_tasks'], data['tasks'])
+    return rows
+
+
+def task_totals(counts):
+    # (tasks, completed tasks) from a {status: {priority: count}} breakdown
+    tasks = sum(sum(priorities.values()) for priorities in counts.values())
+    return tasks, sum(counts.get(Task.Status.COMPLETED, {}).values())
+
+
+def budget_used(spend, budget):
+    return round(spend / budget * 100, 1) if budget else None
+
+
+def money_and_hours():
+    return {
+        'projects': 0,
+        'budget': 0.0,
+        'current_spend': 0.0,
+        'estimated_hours': 0.0,
+        'actual_hours': 0.0,
+        'tasks': 0,
+        'completed_tasks': 0,
+    }
+
+
+def finish(figures):
+    # Derived figures, computed once here instead of on every page view
+    for name in ('budget', 'current_spend', 'estimated_hours', 'actual_hours'):
+        if name in figures:
+            figures[name] = round(figures[name], 2)
+    if 'budget' in figures:
+        figures['budget_used'] = budget_used(figures['current_spend'], figures['budget'])
+        figures['hours_variance'] = round(figures['actual_hours'] - figures['estimated_hours'], 2)
+    figures['completion_rate'] = completion_rate(figures['completed_tasks'], figures['tasks'])
+    return figures
+
+
+def group_rows(projects):
+    """
+    CATEGORY, PRIORITY, STATUS and TOTAL rows as (report, key, label, data),
+    summed from PROJECT row data
+    """
+    by_category = defaultdict(money_and_hours)
+    by_priority = defaultdict(lambda: {'tasks': 0, 'completed_tasks': 0})
+    by_status = defaultdict(lambda: {'tasks': 0, 'completed_tasks': 0})
+    total = money_and_hours()
+    categories = dict(ProjectCategory.objects.values_list('id', 'name'))
+
+    for data in projects:
+        # A category deleted since the row was built counts as none
+        category = data['category'] if data['category'] in categories else None
+        for figures in (by_category[category], total):
+            figures['projects'] += 1
+            figures['budget'] += data['budget'] or 0
+            figures['current_spend'] += data['current_spend']
+            figures['estimated_hours'] += data['estimated_hours']
+            figures['actual_hours'] += data['actual_hours']
+            figures['tasks'] += data['tasks']
+            figures['completed_tasks'] += data['completed_tasks']
+        for status, priorities in data['task_counts'].items():
+            for priority, count in priorities.items():
+                done = count if status == Task.Status.COMPLETED else 0
+                for figures in (by_status[status], by_priority[priority]):
+                    figures['tasks'] += count
+                    figures['completed_tasks'] += done
+
+    rows = [
+        (Report.CATEGORY, str(pk) if pk else UNCATEGORIZED, categories.get(pk, 'Uncategorized'), finish(figures))
+        for pk, figures in by_category.items()
+    ]
+    for pk, name in categories.items():
+        if pk not in by_category:
+            rows.append((Report.CATEGORY, str(pk), name, finish(money_and_hours())))
+    for value, label in Task.Priority.choices:
+        rows.append((Report.PRIORITY, value, label, finish(by_priority[value])))
+    for value, label in Task.Status.choices:
+        figures = finish(by_status[value])
+        figures['share'] = completion_rate(figures['tasks'], total['tasks'])
+        rows.append((Report.STATUS, value, label, figures))
+    rows.append((Report.TOTAL, TOTAL_KEY, 'All projects', finish(total)))
+    return rows
+
+
+def changed_since(since, until):
+    """
+    (ids of projects whose figures may have moved, whether any category was
+    written or deleted) between two change log positions. A project moves
+    when it or one of its tasks was written or deleted; deleted tasks and
+    moves reach the project through its rollup, which logs a project change.
+    """
+    ids, task_ids, categories_changed = set(), set(), False
+    for _, model, object_id, _ in changes_between(since, until).iterator(chunk_size=2000):
+        if model == 'project':
+            ids.add(object_id)
+        elif model == 'task':
+            task_ids.add(object_id)
+        elif model == 'projectcategory':
+            categories_changed = True
+    if task_ids:
+        ids.update(Task.objects.filter(pk__in=task_ids).order_by().values_list('project_id', flat=True).distinct())
+    return ids, categories_changed
+
+
+def upsert(rows, refreshed_at, changes_applied):
+    ReportRow.objects.bulk_create(
+        [ReportRow(report=report, key=key, label=label, data=data, refreshed_at=refreshed_at,
+                   changes_applied=changes_applied)
+         for report, key, label, data in rows],
+        update_conflicts=True,
+        unique_fields=['report', 'key'],
+        update_fields=['label', 'data', 'refreshed_at', 'changes_applied'],
+        batch_size=500,
+    )
+
+
+def refresh_reports(full=False):
+    """
+    Bring the report rows up to date. Only projects changed since the last
+    refresh are re-aggregated from the raw tables; the group rows are then
+    re-summed from the PROJECT rows, which also picks up category renames. Returns the number of projects
+    refreshed.
+    """
+    until = committed_position()
+    now = timezone.now()
+    total = ReportRow.objects.filter(report=Report.TOTAL, key=TOTAL_KEY).values('changes_applied', 'refreshed_at').first()
+    if full or total is None or total['refreshed_at'] < now - CHANGELOG_RETENTION:
+        # First run, or the entries since the last one may have been pruned
+        changed = None
+    else:
+        changed, categories_changed = changed_since(total['changes_applied'], until)
+        # Category labels live in the group rows, so a rename alone re-sums them
+        if not changed and not categories_changed:
+            ReportRow.objects.filter(report=Report.TOTAL, key=TOTAL_KEY).update(changes_applied=until, refreshed_at=now)
+            return 0
+
+    rows = project_rows(changed)
+    with transaction.atomic():
+        stale = ReportRow.objects.filter(report=Report.PROJECT)
+        if changed is not None:
+            # Logged changes to projects deleted since
+            stale = stale.filter(key__in=[str(pk) for pk in changed - rows.keys()])
+        stale.delete()
+        upsert([(Report.PROJECT, str(pk), data['name'], data) for pk, data in rows.items()], now, until)
+
+        projects = ReportRow.objects.filter(report=Report.PROJECT).values_list('data', flat=True)
+        ReportRow.objects.filter(report__in=GROUP_REPORTS).delete()
+        upsert(group_rows(projects.iterator(chunk_size=2000)), now, until)
+    return len(rows)
+
+
+# Payload section per report, and the order its rows are listed in
+SECTIONS = {
+    Report.CATEGORY: ('by_category', lambda row: row['label'].lower()),
+    Report.PRIORITY: ('by_priority', lambda row: Task.Priority.values.index(row['key'])),
+    Report.STATUS: ('by_status', lambda row: Task.Status.values.index(row['key'])),
+    Report.PROJECT: ('projects', lambda row: row['label'].lower()),
+}
+
+
+def report_payload():
+    """
+    Reports page payload, read straight from the stored rows in one query
+    """
+    payload = {'refreshed_at': None, 'totals': None, **{section: [] for section, _ in SECTIONS.values()}}
+    for report, key, label, data, refreshed_at in ReportRow.objects.values_list(
+        'report', 'key', 'label', 'data', 'refreshed_at',
+    ):
+        if report == Report.TOTAL:
+            payload['refreshed_at'] = refreshed_at
+            payload['totals'] = data
+        else:
+            payload[SECTIONS[report][0]].append({'key': key, 'label': label, **data})
+    for section, order in SECTIONS.values():
+        payload[section].sort(key=order)
+    return payload
@@ -0,0 +1,135 @@
+# core/search.py
+from django.db import connections
+from django.db.models import F, FloatField
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+# Tables with a full-text index, and the text columns they cover
+SEARCH_INDEXES = {
+    'projects_project': ['name', 'description'],
+    'tasks_task': ['title', 'description'],
+}
+
+# Relative weight of a match in each indexed column, first column first
+SQLITE_WEIGHTS = (4.0, 1.0)
+POSTGRES_WEIGHTS = ('A', 'B')
+
+# Text search configuration used for both the index and the queries (Postgres)
+POSTGRES_CONFIG = 'english'
+
+
+def sqlite_statements(table, columns):
+    fts = f'{table}_fts'
+    cols = ', '.join(columns)
+    new = ', '.join(f'new.{c}' for c in columns)
+    old = ', '.join(f'old.{c}' for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, content='{table}', "
+        f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+    ]
+
+
+def postgres_statements(table, columns):
+    document = ' || '.join(
+        f"setweight(to_tsvector('{POSTGRES_CONFIG}', coalesce({c}, '')), '{w}')"
+        for c, w in zip(columns, POSTGRES_WEIGHTS)
+    )
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({document}) STORED",
+        f"CREATE INDEX IF NOT EXISTS {table}_search_idx ON {table} USING GIN (search_vector)",
+    ]
+
+
+def install_search_indexes(using_connection, rebuild=False):
+    """
+    Create the full-text indexes and the machinery keeping them in sync.
+    Idempotent: SQLite table rebuilds in later migrations drop triggers, so
+    this also runs after every migrate.
+    """
+    vendor = using_connection.vendor
+    with using_connection.cursor() as cursor:
+        for table, columns in SEARCH_INDEXES.items():
+            if vendor == 'sqlite':
+                for statement in sqlite_statements(table, columns):
+                    cursor.execute(statement)
+                if rebuild:
+                    cursor.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+            elif vendor == 'postgresql':
+                # The generated column is recomputed by Postgres on every write
+                for statement in postgres_statements(table, columns):
+                    cursor.execute(statement)
+
+
+def ensure_search_indexes(sender, using, **kwargs):
+    """
+    post_migrate receiver reinstalling triggers that SQLite table rebuilds
+    may have dropped
+    """
+    using_connection = connections[using]
+    # Not after migrating back past the migration that installed them
+    if ('core', '0002_fulltext_search') in MigrationRecorder(using_connection).applied_migrations():
+        install_search_indexes(using_connection)
+
+
+def drop_search_indexes(using_connection):
+    vendor = using_connection.vendor
+    with using_connection.cursor() as cursor:
+        for table in SEARCH_INDEXES:
+            if vendor == 'sqlite':
+                for suffix in ('ai', 'ad', 'au'):
+                    cursor.execute(f'DROP TRIGGER IF EXISTS {table}_fts_{suffix}')
+                cursor.execute(f'DROP TABLE IF EXISTS {table}_fts')
+            elif vendor == 'postgresql':
+                cursor.execute(f'DROP INDEX IF EXISTS {table}_search_idx')
+                cursor.execute(f'ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector')
+
+
+def sqlite_match_expression(terms):
+    # Every term must match, as a prefix, with FTS5 syntax characters quoted away
+    return ' AND '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter answering ?search= from the full-text index, best match
+    first. Falls back to the icontains search on other databases.
+    """
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        table = queryset.model._meta.db_table
+        vendor = connections[queryset.db].vendor
+        if not terms or table not in SEARCH_INDEXES or vendor not in ('sqlite', 'postgresql'):
+            return super().filter_queryset(request, queryset, view)
+
+        if vendor == 'sqlite':
+            fts = f'{table}_fts'
+            # One MATCH joined on rowid: the rank is read off the joined row,
+            # not from a subquery re-running the match for every row
+            queryset = queryset.extra(
+                tables=[fts], where=[f'{fts}.rowid = {table}.id', f'{fts} MATCH %s'],
+                params=[sqlite_match_expression(terms)],
+            )
+            # bm25 is lower-is-better, so negate it to rank descending
+            weights = ', '.join(str(w) for w in SQLITE_WEIGHTS)
+            rank = RawSQL(f'-bm25({fts}, {weights})', (), output_field=FloatField())
+        else:
+            query = f"websearch_to_tsquery('{POSTGRES_CONFIG}', %s)"
+            search = ' '.join(terms)
+            queryset = queryset.filter(pk__in=RawSQL(f'SELECT id FROM {table} WHERE search_vector @@ {query}', (search,)))
+            rank = RawSQL(f'ts_rank({table}.search_vector, {query})', (search,), output_field=FloatField())
+
+        queryset = queryset.annotate(search_rank=rank)
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by(F('search_rank').desc(), F('id').desc())
+        return queryset
+
@@ -0,0 +1,88 @@
+# core/serializers.py
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+SAFE_READ_METHODS = ('GET', 'HEAD')
+
+
+def split_param(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def write_only_fields(serializer_class):
+    extra_kwargs = getattr(serializer_class.Meta, 'extra_kwargs', {})
+    declared = {name for name, field in serializer_class._declared_fields.items() if field.write_only}
+    return declared | {name for name, options in extra_kwargs.items() if options.get('write_only')}
+
+
+def sparse_fields(request, serializer_class):
+    """
+    Field names selected by ?fields= and/or ?omit= on a read request, in
+    serializer order, or None when the full representation was asked for
+    """
+    if request is None or request.method not in SAFE_READ_METHODS:
+        return None
+    fields = request.query_params.get('fields')
+    omit = request.query_params.get('omit')
+    if not fields and not omit:
+        return None
+
+    write_only = write_only_fields(serializer_class)
+    available = [name for name in serializer_class.Meta.fields if name not in write_only]
+    wanted = split_param(fields) if fields else set(available)
+    omitted = split_param(omit) if omit else set()
+    unknown = (wanted | omitted) - set(serializer_class.Meta.fields)
+    if unknown:
+        raise serializers.ValidationError({'fields': f'Unknown field(s): {", ".join(sorted(unknown))}'})
+    # Input-only fields never appear in responses, so selecting them would
+    # return empty objects
+    if (wanted | omitted) & write_only:
+        names = ', '.join(sorted((wanted | omitted) & write_only))
+        raise serializers.ValidationError({'fields': f'Write-only field(s) cannot be selected: {names}'})
+    return [name for name in available if name in wanted and name not in omitted]
+
+
+def model_columns(serializer_class, fields):
+    """
+    Columns to load for the selected serializer fields. Computed fields
+    declare theirs in Meta.sparse_columns; model fields map to themselves.
+    """
+    model = serializer_class.Meta.model
+    sparse_columns = getattr(serializer_class.Meta, 'sparse_columns', {})
+    columns = ['id']
+    for name in fields:
+        if name in sparse_columns:
+            columns.extend(sparse_columns[name])
+            continue
+        try:
+            if model._meta.get_field(name).concrete:
+                columns.append(name)
+        except FieldDoesNotExist:
+            pass
+    return list(dict.fromkeys(columns))
+
+
+class SparseFieldsetsMixin:
+    """
+    Serializer mixin dropping the fields not selected with ?fields= / ?omit=
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = sparse_fields(self.context.get('request'), type(self))
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField resolving from a {pk: instance} map that bulk
+    endpoints put in context['prefetched'][field_name], so a payload of N
+    rows costs one lookup query instead of N. Misses fall back to the
+    regular per-value query and its error messages.
+    """
+    def to_internal_value(self, data):
+        prefetched = self.context.get('prefetched', {}).get(self.field_name, {})
+        if isinstance(data, int) and data in prefetched:
+            return prefetched[data]
+        return super().to_internal_value(data)
@@ -0,0 +1,195 @@
+# core/signals.py
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from projects.models import Project, ProjectCategory
+from tasks.models import Task
+from . import activity
+from .cache import bump_data_version, bump_data_version_on_commit, bump_generation
+from .changelog import record_changes
+from .events import publish
+from .models import ActivityEvent
+
+# Marker for rows loaded with a tracked column deferred
+UNKNOWN = object()
+
+# Columns whose loaded values the save/delete receivers compare against
+TRACKED_FIELDS = {
+    Project: ('status',),
+    Task: ('project_id', 'status'),
+}
+
+_bulk_write = ContextVar('bulk_write', default=False)
+
+
+@contextmanager
+def bulk_write():
+    """
+    Silence the per-row receivers while a bulk operation runs; the caller
+    takes care of rollups, caches and activity for the whole batch
+    """
+    token = _bulk_write.set(True)
+    try:
+        yield
+    finally:
+        _bulk_write.reset(token)
+
+
+def in_bulk_write():
+    return _bulk_write.get()
+
+
+def notify_on_commit(event):
+    """
+    After commit, invalidate versioned caches and tell live streams what changed
+    """
+    def notify():
+        bump_generation(event['model'])
+        event['version'] = bump_data_version()
+        publish(event)
+
+    transaction.on_commit(notify, robust=True)
+
+
+def data_changed(sender, instance, created=None, **kwargs):
+    if in_bulk_write():
+        return
+    notify_on_commit({
+        'model': sender._meta.model_name,
+        'id': instance.pk,
+        'label': str(instance),
+        'action': 'deleted' if created is None else 'created' if created else 'updated',
+    })
+
+
+for model in (Project, ProjectCategory, Task):
+    post_save.connect(data_changed, sender=model, dispatch_uid=f'data-changed-save-{model.__name__}')
+    post_delete.connect(data_changed, sender=model, dispatch_uid=f'data-changed-delete-{model.__name__}')
+
+
+
+def log_change(sender, instance, created=None, **kwargs):
+    # In the writing transaction, for delta sync and the report refresh;
+    # bulk operations log theirs in batch
+    if not in_bulk_write():
+        record_changes(sender._meta.model_name, [instance.pk], deleted=created is None)
+
+
+for model in (Project, ProjectCategory, Task):
+    post_save.connect(log_change, sender=model, dispatch_uid=f'log-change-save-{model.__name__}')
+    post_delete.connect(log_change, sender=model, dispatch_uid=f'log-change-delete-{model.__name__}')
+
+
+@receiver(post_save, sender=ProjectCategory)
+@receiver(pre_delete, sender=ProjectCategory)
+def log_category_projects(sender, instance, created=False, **kwargs):
+    """
+    Projects embed their category: a rename changes them, and a delete
+    clears their category with an UPDATE that sends no signals
+    """
+    if not created and not in_bulk_write():
+        record_changes('project', Project.objects.filter(category=instance).values_list('id', flat=True))
+
+
+@receiver(m2m_changed, sender=Project.team_members.through)
+def bump_on_team_change(sender, action, **kwargs):
+    # Membership drives the per-user stats
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_data_version_on_commit()
+
+
+@receiver(post_save, sender=User)
+def bump_on_user_created(sender, created, **kwargs):
+    # Only account creation changes the team size; logins also save the user
+    if created:
+        bump_data_version_on_commit()
+
+
+post_delete.connect(bump_data_version_on_commit, sender=User, dispatch_uid='data-version-delete-User')
+
+
+def current_state(instance):
+    return {name: getattr(instance, name) for name in TRACKED_FIELDS[type(instance)]}
+
+
+@receiver(post_init, sender=Project)
+@receiver(post_init, sender=Task)
+def remember_loaded_state(sender, instance, **kwargs):
+    """
+    Keep the tracked values the row was loaded with, so that receivers can
+    tell what a save changed (status transitions, task rollup deltas)
+    """
+    if instance.pk is None:
+        instance._loaded_state = None
+    elif all(name in instance.__dict__ for name in TRACKED_FIELDS[sender]):
+        instance._loaded_state = current_state(instance)
+    else:
+        instance._loaded_state = UNKNOWN
+
+
+@receiver(pre_save, sender=Project)
+@receiver(pre_save, sender=Task)
+@receiver(pre_delete, sender=Project)
+@receiver(pre_delete, sender=Task)
+def load_state(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # One query for rows loaded with a tracked column deferred; bulk deletes
+    # settle their rollups themselves
+    if instance._loaded_state is UNKNOWN and not (kwargs['signal'] is pre_delete and in_bulk_write()):
+        instance._loaded_state = sender.objects.filter(pk=instance.pk).values(*TRACKED_FIELDS[sender]).first()
+        for name, value in (instance._loaded_state or {}).items():
+            # Still deferred means unchanged: spare the receivers a refresh query
+            instance.__dict__.setdefault(name, value)
+    instance._previous_state = instance._loaded_state
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Task)
+def reset_loaded_state(sender, instance, raw=False, **kwargs):
+    # Receivers read _previous_state, so the order they run in does not matter
+    if not raw:
+        instance._loaded_state = current_state(instance)
+
+
+def previous_state(instance, created=False):
+    """
+    Tracked values before the save or delete in progress, None for new rows
+    (or unknown ones, inside bulk deletes)
+    """
+    state = getattr(instance, '_previous_state', None)
+    return None if created or state is UNKNOWN else state
+
+
+def became_completed(instance, created):
+    previous = previous_state(instance, created)
+    return (
+        previous is not None
+        and instance.status == 'COMPLETED'
+        and previous['status'] != 'COMPLETED'
+    )
+
+
+@receiver(post_save, sender=Project)
+def record_project_activity(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        activity.record(ActivityEvent.Kind.PROJECT_CREATED, instance)
+    elif became_completed(instance, created):
+        activity.record(ActivityEvent.Kind.PROJECT_COMPLETED, instance)
+
+
+@receiver(post_save, sender=Task)
+def record_task_activity(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        activity.record(ActivityEvent.Kind.TASK_CREATED, instance, project_name=instance.project.name)
+    elif became_completed(instance, created):
+        activity.record(ActivityEvent.Kind.TASK_COMPLETED, instance, project_name=instance.project.name)
@@ -0,0 +1,192 @@
+# core/stats.py
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+from projects.models import Project
+from tasks.models import Task
+
+OPEN_PROJECT_STATUSES = ['PLANNING', 'IN_PROGRESS']
+OPEN_TASK_STATUSES = ['TODO', 'IN_PROGRESS']
+
+# completed_date is already a date, so daily buckets group on the column itself
+BUCKETS = {
+    'day': F,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+
+def project_counters(today=None):
+    """
+    Collect every project counter used by the dashboards in a single query
+    """
+    today = today or timezone.now().date()
+    aggregates = {
+        'total': Count('id'),
+        'overdue': Count('id', filter=Q(
+            estimated_completion_date__lt=today,
+            status__in=OPEN_PROJECT_STATUSES
+        )),
+    }
+    for value in Project.Status.values:
+        aggregates[value] = Count('id', filter=Q(status=value))
+
+    counts = Project.objects.aggregate(**aggregates)
+    return {
+        'total': counts['total'],
+        'overdue': counts['overdue'],
+        'by_status': {value: counts[value] for value in Project.Status.values},
+    }
+
+
+def task_counters(today=None):
+    """
+    Collect every task counter used by the dashboards in a single query
+    """
+    today = today or timezone.now().date()
+    aggregates = {
+        'total': Count('id'),
+        'overdue': Count('id', filter=Q(
+            due_date__lt=today,
+            status__in=OPEN_TASK_STATUSES
+        )),
+    }
+    for value in Task.Status.values:
+        aggregates[value] = Count('id', filter=Q(status=value))
+
+    counts = Task.objects.aggregate(**aggregates)
+    return {
+        'total': counts['total'],
+        'overdue': counts['overdue'],
+        'by_status': {value: counts[value] for value in Task.Status.values},
+    }
+
+
+def user_counters(user):
+    """
+    Project and task counters for the projects `user` is a team member of,
+    one aggregate query per table
+    """
+    projects = Project.objects.filter(team_members=user).aggregate(
+        total_projects=Count('id'),
+        active_projects=Count('id', filter=Q(status='IN_PROGRESS')),
+        completed_projects=Count('id', filter=Q(status='COMPLETED')),
+    )
+    tasks = Task.objects.filter(project__team_members=user).aggregate(
+        total_tasks=Count('id'),
+        completed_tasks=Count('id', filter=Q(status='COMPLETED')),
+    )
+    return {**projects, **tasks}
+
+
+def team_workload():
+    """
+    Per active user: projects they are a team member of, and the open and
+    completed task counts and estimated/actual hours across those projects.
+    One grouped query per table, however many users there are.
+    """
+    users = (
+        User.objects.filter(is_active=True)
+        .annotate(project_count=Count('projects'))
+        .order_by('first_name', 'last_name', 'username')
+        .values_list('id', 'username', 'first_name', 'last_name', 'email', 'project_count')
+    )
+    # Joining through team_members yields each task once per member
+    tasks = (
+        Task.objects.filter(project__team_members__is_active=True)
+        .order_by()
+        .values('project__team_members')
+        .annotate(
+            open_tasks=Count('id', filter=~Q(status='COMPLETED')),
+            completed_tasks=Count('id', filter=Q(status='COMPLETED')),
+            estimated_hours=Sum('estimated_hours'),
+            actual_hours=Sum('actual_hours'),
+        )
+    )
+    workload = {row.pop('project__team_members'): row for row in tasks}
+
+    members = []
+    for pk, username, first_name, last_name, email, project_count in users:
+        row = workload.get(pk, {})
+        members.append({
+            'id': pk,
+            'username': username,
+            'first_name': first_name,
+            'last_name': last_name,
+            'email': email,
+            'projects': project_count,
+            'open_tasks': row.get('open_tasks', 0),
+            'completed_tasks': row.get('completed_tasks', 0),
+            'estimated_hours': float(row.get('estimated_hours') or 0),
+            'actual_hours': float(row.get('actual_hours') or 0),
+        })
+    return members
+
+
+def bucket_start(date, bucket):
+    if bucket == 'week':
+        return date - timedelta(days=date.weekday())
+    if bucket == 'month':
+        return date.replace(day=1)
+    return date
+
+
+def next_bucket(date, bucket):
+    if bucket == 'week':
+        return date + timedelta(days=7)
+    if bucket == 'month':
+        return (date.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return date + timedelta(days=1)
+
+
+def bucket_count(start, end, bucket):
+    # Buckets completion_series would return, without building them
+    first, last = bucket_start(start, bucket), bucket_start(end, bucket)
+    if bucket == 'week':
+        return (last - first).days // 7 + 1
+    if bucket == 'month':
+        return (last.year - first.year) * 12 + last.month - first.month + 1
+    return (last - first).days + 1
+
+
+def completion_series(start, end, bucket='day'):
+    """
+    Completed tasks per day/week/month between `start` and `end` (inclusive),
+    zero-filled, from a single grouped query over completed_date
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f'Unknown bucket "{bucket}"')
+    rows = (
+        Task.objects.filter(
+            status='COMPLETED',
+            completed_date__gte=start,
+            completed_date__lte=end,
+        )
+        .order_by()
+        .annotate(period=BUCKETS[bucket]('completed_date'))
+        .values('period')
+        .annotate(completed=Count('id'))
+    )
+    counts = {row['period']: row['completed'] for row in rows}
+
+    series = []
+    current = bucket_start(start, bucket)
+    while current <= end:
+        series.append({
+            'date': current.strftime('%Y-%m-%d'),
+            'day': current.strftime('%a'),
+            'completed': counts.get(current, 0),
+        })
+        try:
+            current = next_bucket(current, bucket)
+        except OverflowError:
+            break  # last bucket before date.max
+    return series
+
+
+def completion_rate(done, total):
+    return round((done / total * 100) if total > 0 else 0, 1)
@@ -0,0 +1,146 @@
+# core/sync.py
+import base64
+import json
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .changelog import CHANGELOG_RETENTION, changes_between, committed_position
+from .export import list_view, serialized_rows
+
+# Most rows returned per section (projects, tasks) per full-sync request,
+# and most change log entries read per delta request
+SYNC_PAGE_SIZE = 500
+
+
+# An entry can be stamped shortly before the position that first excludes it
+# is read, while its transaction is still open; tokens expire this much
+# ahead of pruning so such entries are never lost
+EXPIRY_MARGIN = timedelta(days=1)
+
+
+class TokenExpired(ValueError):
+    pass
+
+
+def sync_viewsets():
+    # Imported lazily: the viewsets import core modules themselves
+    from projects.views import ProjectViewSet
+    from tasks.views import TaskViewSet
+
+    return {'projects': ProjectViewSet, 'tasks': TaskViewSet}
+
+
+# ChangeLog.model -> response section; category changes reach the client
+# through the projects they are logged against
+CHANGE_SECTIONS = {'project': 'projects', 'task': 'tasks'}
+
+
+def encode_token(since, position, full=None):
+    data = {'since': since.isoformat(), 'position': position}
+    if full:
+        data['full'] = full
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def decode_token(token):
+    """
+    (change log position, time the entries after it began, {section: last
+    id} while a full sync is still paging, else None) from an opaque sync
+    token; raises ValueError, or TokenExpired when the entries after it may
+    have been pruned
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode()))
+        since = parse_datetime(data['since'])
+        position = int(data['position'])
+        full = data.get('full')
+        if full is not None:
+            full = {section: int(full[section]) for section in sync_viewsets() if section in full}
+    except (KeyError, TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError('Invalid sync token') from exc
+    if since is None:
+        raise ValueError('Invalid sync token')
+    # Pruning goes by changed_at, so the entries still needed decide, not
+    # when the token was handed out
+    if since < timezone.now() - CHANGELOG_RETENTION + EXPIRY_MARGIN:
+        raise TokenExpired('Sync token expired, start a full sync')
+    return position, since, full
+
+
+def full_page(full, limit):
+    """
+    Next page of every section still being read in full, in id order
+    """
+    payload = {'deleted': {section: [] for section in CHANGE_SECTIONS.values()}}
+    remaining = {}
+    for section, viewset in sync_viewsets().items():
+        if section not in full:
+            payload[section] = []
+            continue
+        view = list_view(viewset)
+        queryset = view.get_queryset().filter(id__gt=full[section]).order_by('id')
+        rows = list(serialized_rows(view, queryset[:limit + 1]))
+        if len(rows) > limit:
+            rows = rows[:limit]
+            remaining[section] = rows[-1]['id']
+        payload[section] = rows
+    return payload, remaining
+
+
+def delta_page(position, until, limit):
+    """
+    Current rows for the projects and tasks changed in (position, until],
+    and the ids deleted there; returns (payload, position reached)
+    """
+    entries = list(changes_between(position, until)[:limit + 1])
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # A row's last entry wins: written then deleted is reported deleted
+    latest = {}
+    for _, model, object_id, deleted in entries:
+        if model in CHANGE_SECTIONS:
+            latest[(CHANGE_SECTIONS[model], object_id)] = deleted
+
+    payload = {'has_more': has_more, 'deleted': {}}
+    for section, viewset in sync_viewsets().items():
+        written = [pk for (name, pk), deleted in latest.items() if name == section and not deleted]
+        payload['deleted'][section] = sorted(pk for (name, pk), deleted in latest.items() if name == section and deleted)
+        if not written:
+            payload[section] = []
+            continue
+        view = list_view(viewset)
+        # Rows deleted since are gone here; their delete entry comes later
+        payload[section] = list(serialized_rows(view, view.get_queryset().filter(id__in=written).order_by('id')))
+    return payload, entries[-1][0] if has_more else until
+
+
+def changes_since(token=None, limit=None):
+    """
+    Projects and tasks created or updated, and ids deleted, since `token`.
+    Without one, every row is returned a page at a time; after that, the
+    change log is read from the position the full sync started at, so the
+    cost follows the amount of change. Returns the payload including the
+    token for the next call.
+    """
+    limit = limit or SYNC_PAGE_SIZE
+    if token:
+        position, since, full = decode_token(token)
+    else:
+        since = timezone.now()
+        position, full = committed_position(), {section: 0 for section in sync_viewsets()}
+
+    if full:
+        payload, full = full_page(full, limit)
+        payload['has_more'] = bool(full)
+    else:
+        reading = timezone.now()
+        payload, position = delta_page(position, committed_position(), limit)
+        if not payload['has_more']:
+            # Caught up: every entry still needed is written from now on.
+            # While a backlog is paged, its oldest entries keep `since`.
+            since = reading
+    payload['token'] = encode_token(since, position, full)
+    return payload
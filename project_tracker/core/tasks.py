@@ -0,0 +1,66 @@
+# core/tasks.py
+from pathlib import Path
+
+from celery import shared_task
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .activity import record_overdue_tasks
+from .changelog import prune_changes
+from .export import export_chunks, export_viewsets, list_view, write_export
+from .jobs import MeteredTask
+from .reports import refresh_reports
+
+
+@shared_task(base=MeteredTask)
+def log_overdue_tasks():
+    return record_overdue_tasks()
+
+
+@shared_task(base=MeteredTask)
+def prune_changelog():
+    return prune_changes()
+
+
+@shared_task(base=MeteredTask)
+def optimize_sqlite():
+    """
+    Periodic PRAGMA optimize for SQLITE_PERFORMANCE_MODE; no-op otherwise
+    """
+    from project_tracker.database import optimize_database
+
+    return optimize_database()
+
+
+@shared_task(base=MeteredTask)
+def generate_reports(full=False):
+    """
+    Bring the report rows up to date, then rebuild the dashboard and team
+    workload snapshots so the next page load reads them from the cache;
+    pointless with a per-process cache, which the web workers never see.
+    Returns the number of projects whose report rows were refreshed.
+    """
+    from project_tracker.views import dashboard_snapshot
+    from .cache import get_snapshot, shared_cache
+    from .stats import team_workload
+
+    refreshed = refresh_reports(full=full)
+    if shared_cache():
+        dashboard_snapshot()
+        get_snapshot('team-workload', team_workload)
+    return refreshed
+
+
+@shared_task(base=MeteredTask, bind=True, autoretry_for=(DatabaseError, OSError))
+def export_dataset(self, dataset, export_format='csv', query=''):
+    """
+    Write a projects/tasks export under EXPORT_ROOT, with the same filters as
+    the list API. Returns the file path.
+    """
+    root = Path(getattr(settings, 'EXPORT_ROOT', Path(settings.MEDIA_ROOT) / 'exports'))
+    root.mkdir(parents=True, exist_ok=True)
+    stamp = timezone.now().strftime('%Y%m%d-%H%M%S')
+    path = root / f'{dataset}-{stamp}-{self.request.id}.{export_format}'
+    view = list_view(export_viewsets()[dataset], query)
+    return str(write_export(export_chunks(view, export_format), path))
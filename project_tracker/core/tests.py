@@ -1,3 +1,939 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from projects.models import Project, ProjectCategory
+from tasks.models import Task
+from core.changelog import CHANGELOG_RETENTION
+from core.sync import TokenExpired, decode_token
+from core.stats import project_counters, task_counters, completion_series, team_workload
+from core.activity import record_overdue_tasks
+from core.cache import get_data_version, get_snapshot, response_cache_stats
+from core.events import InProcessBroker, get_broker
+from core.jobs import job_stats, metered_jobs
+from core.models import ActivityEvent, ChangeLog, JobStat, ReportRow
+from core.queryplan import QueryPlanAssertions, explain
+from core.reports import group_rows, project_rows, refresh_reports, report_payload
+from core.tasks import export_dataset, generate_reports
+from project_tracker.database import apply_pragmas, database_settings, optimize_database
+from project_tracker.views import build_dashboard_payload, dashboard_events
+from projects.tasks import rebuild_rollups
+
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.now().date()
+        self.project = Project.objects.create(
+            name='Alpha', status='IN_PROGRESS',
+            estimated_completion_date=self.today - timedelta(days=1)
+        )
+        Project.objects.create(name='Beta', status='COMPLETED')
+        Task.objects.create(title='Open', project=self.project, status='TODO',
+                            due_date=self.today - timedelta(days=2))
+        Task.objects.create(title='Done', project=self.project, status='COMPLETED',
+                            completed_date=self.today)
+        Task.objects.create(title='Done earlier', project=self.project, status='COMPLETED',
+                            completed_date=self.today - timedelta(days=3))
+
+    def test_project_counters_single_query(self):
+        with self.assertNumQueries(1):
+            stats = project_counters(self.today)
+        self.assertEqual(stats['total'], 2)
+        self.assertEqual(stats['overdue'], 1)
+        self.assertEqual(stats['by_status']['IN_PROGRESS'], 1)
+        self.assertEqual(stats['by_status']['COMPLETED'], 1)
+        self.assertEqual(stats['by_status']['CANCELLED'], 0)
+
+    def test_task_counters_single_query(self):
+        with self.assertNumQueries(1):
+            stats = task_counters(self.today)
+        self.assertEqual(stats['total'], 3)
+        self.assertEqual(stats['overdue'], 1)
+        self.assertEqual(stats['by_status']['COMPLETED'], 2)
+
+    def test_completion_series_single_query(self):
+        with self.assertNumQueries(1):
+            series = completion_series(self.today - timedelta(days=6), self.today)
+        self.assertEqual(len(series), 7)
+        self.assertEqual(series[-1]['completed'], 1)
+        self.assertEqual(series[-4]['completed'], 1)
+        self.assertEqual(sum(row['completed'] for row in series), 2)
+
+    def test_completion_series_buckets(self):
+        start = self.today - timedelta(days=365)
+        with self.assertNumQueries(1):
+            months = completion_series(start, self.today, 'month')
+        self.assertIn(len(months), (12, 13))
+        self.assertEqual(sum(row['completed'] for row in months), 2)
+        weeks = completion_series(start, self.today, 'week')
+        self.assertTrue(all(
+            date.fromisoformat(row['date']).weekday() == 0 for row in weeks
+        ))
+        self.assertEqual(sum(row['completed'] for row in weeks), 2)
+
+    def test_completions_endpoint(self):
+        user = User.objects.create_user('viewer', password='pass12345')
+        self.client.force_login(user)
+        response = self.client.get('/api/stats/completions/', {
+            'start': (self.today - timedelta(days=29)).isoformat(),
+            'end': self.today.isoformat(),
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 30)
+        response = self.client.get('/api/stats/completions/', {'bucket': 'year'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/stats/completions/', {'start': '2025-13-01'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/stats/completions/', {'end': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+        for bucket in ('day', 'week', 'month'):
+            response = self.client.get('/api/stats/completions/', {
+                'bucket': bucket, 'start': '0001-01-01', 'end': '9999-12-31',
+            })
+            self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/stats/completions/', {
+            'bucket': 'month', 'start': '9990-01-01', 'end': '9999-12-31',
+        })
+        self.assertEqual(len(response.json()['results']), 120)
+
+    def test_dashboard_data_endpoint(self):
+        user = User.objects.create_user('viewer', password='pass12345')
+        self.client.force_login(user)
+        response = self.client.get('/api/dashboard/data/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(data['total_tasks'], 3)
+        self.assertEqual(data['completed_tasks'], 2)
+        self.assertEqual(data['overdue_projects'], 1)
+
+    def test_dashboard_page_renders_counters(self):
+        user = User.objects.create_user('viewer', password='pass12345')
+        self.client.force_login(user)
+        response = self.client.get('/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('error_message', response.context)
+        self.assertEqual(response.context['total_projects'], 2)
+        self.assertEqual(response.context['tasks_by_status']['TODO'], 1)
+
+
+class DashboardSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.now().date()
+        self.project = Project.objects.create(name='Alpha')
+
+    def snapshot(self):
+        return get_snapshot('dashboard', lambda: build_dashboard_payload(self.today), self.today)
+
+    def test_snapshot_served_without_queries(self):
+        self.assertEqual(self.snapshot()['total_projects'], 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.snapshot()['total_projects'], 1)
+
+    def test_writes_bump_version(self):
+        self.snapshot()
+        version = get_data_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(title='New', project=self.project)
+        self.assertGreater(get_data_version(), version)
+        self.assertEqual(self.snapshot()['total_tasks'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.delete()
+        self.assertEqual(self.snapshot()['total_projects'], 0)
+
+    def test_version_survives_eviction(self):
+        version = get_data_version()
+        cache.delete('core:data-version')
+        self.assertGreater(get_data_version(), version)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('viewer', password='pass12345')
+        self.client.force_login(self.user)
+        self.project = Project.objects.create(name='Alpha')
+
+    def assertRevalidates(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(title='New', project=self.project)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_dashboard_data(self):
+        self.assertRevalidates('/api/dashboard/data/')
+
+    def test_project_list_and_detail(self):
+        self.assertRevalidates('/api/projects/projects/')
+        self.assertRevalidates(f'/api/projects/projects/{self.project.pk}/')
+
+    def test_task_list(self):
+        self.assertRevalidates('/api/tasks/tasks/?status=TODO')
+
+
+class DashboardStreamTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('viewer', password='pass12345')
+        Project.objects.create(name='Alpha')
+
+    async def test_broker_fan_out_from_threads(self):
+        broker = InProcessBroker()
+        async with broker.subscribe() as first, broker.subscribe() as second:
+            await sync_to_async(broker.publish, thread_sensitive=False)({'id': 1})
+            self.assertEqual(await first.get(timeout=1), {'id': 1})
+            self.assertEqual(await second.get(timeout=1), {'id': 1})
+            self.assertIsNone(await first.get(timeout=0.01))
+        self.assertEqual(broker._subscribers, set())
+
+    async def test_stream_pushes_snapshot_then_deltas(self):
+        stream = dashboard_events()
+        first = await anext(stream)
+        self.assertTrue(first.startswith('event: dashboard\n'))
+        self.assertIn('"total_projects": 1', first)
+
+        get_broker().publish({'model': 'task', 'id': 7, 'action': 'created'})
+        get_broker().publish({'model': 'task', 'id': 8, 'action': 'created'})
+        self.assertTrue((await anext(stream)).startswith('event: activity\n'))
+        self.assertTrue((await anext(stream)).startswith('event: activity\n'))
+        self.assertTrue((await anext(stream)).startswith('event: dashboard\n'))
+        await stream.aclose()
+        self.assertEqual(get_broker()._subscribers, set())
+
+    async def test_stream_response_over_asgi(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get('/api/dashboard/stream/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+    def test_stream_requires_login_and_asgi(self):
+        response = self.client.get('/api/dashboard/stream/')
+        self.assertEqual(response.status_code, 401)
+        self.client.force_login(self.user)
+        response = self.client.get('/api/dashboard/stream/')
+        self.assertEqual(response.status_code, 204)
+
+
+class ActivityFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('viewer', password='pass12345')
+        self.client.force_login(self.user)
+
+    def test_lifecycle_events_are_logged(self):
+        project = Project.objects.create(name='Alpha')
+        task = Task.objects.create(title='Write docs', project=project)
+        task.status = 'COMPLETED'
+        task.save()
+        task.save()
+        project = Project.objects.only('id', 'name').get(pk=project.pk)
+        project.status = 'COMPLETED'
+        project.save()
+        kinds = list(ActivityEvent.objects.order_by('id').values_list('kind', flat=True))
+        self.assertEqual(kinds, [
+            'PROJECT_CREATED', 'TASK_CREATED', 'TASK_COMPLETED', 'PROJECT_COMPLETED',
+        ])
+        self.assertEqual(ActivityEvent.objects.get(kind='TASK_COMPLETED').project_name, 'Alpha')
+
+    def test_feed_is_ordered_and_paginates_by_cursor(self):
+        project = Project.objects.create(name='Alpha')
+        for i in range(11):
+            Task.objects.create(title=f'Task {i}', project=project)
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 5}
+            if cursor:
+                params['cursor'] = cursor
+            with self.assertNumQueries(3):  # session, user, feed page
+                body = self.client.get('/api/recent-activity/', params).json()
+            seen.extend(item['id'] for item in body['results'])
+            cursor = body['next']
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 12)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_overdue_events_change_the_etag(self):
+        project = Project.objects.create(name='Alpha')
+        Task.objects.create(title='Late', project=project, due_date=timezone.now().date() - timedelta(days=1))
+        etag = self.client.get('/api/recent-activity/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(record_overdue_tasks(), 1)
+        response = self.client.get('/api/recent-activity/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['kind'], 'TASK_OVERDUE')
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/recent-activity/', {'cursor': 'nope'})
+        self.assertEqual(response.status_code, 400)
+
+
+# Exercises the database path, not the response cache
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class FullTextSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.alpha = Project.objects.create(name='Website redesign', description='New landing page')
+        self.beta = Project.objects.create(name='Mobile app', description='Redesign onboarding screens')
+        Project.objects.create(name='Data warehouse', description='Nightly loads')
+        self.task = Task.objects.create(title='Write migration plan', project=self.alpha,
+                                        description='Database migration for the redesign')
+        Task.objects.create(title='Review wireframes', project=self.beta)
+
+    def search(self, url, term, **params):
+        body = self.client.get(url, {'search': term, **params}).json()
+        return [row['id'] for row in body['results']]
+
+    def test_ranks_matches_and_prefixes(self):
+        ids = self.search('/api/projects/projects/', 'redesig')
+        # The name hit outranks the description hit
+        self.assertEqual(ids, [self.alpha.id, self.beta.id])
+        self.assertEqual(self.search('/api/projects/projects/', 'mobile onboarding'), [self.beta.id])
+        self.assertEqual(self.search('/api/projects/projects/', 'nothing'), [])
+
+    def test_index_follows_writes(self):
+        self.task.title = 'Draft rollout checklist'
+        self.task.save()
+        self.assertEqual(self.search('/api/tasks/tasks/', 'checklist'), [self.task.id])
+        self.assertEqual(self.search('/api/tasks/tasks/', 'plan'), [])
+        self.task.delete()
+        self.assertEqual(self.search('/api/tasks/tasks/', 'checklist'), [])
+
+    def test_explicit_ordering_and_syntax_characters(self):
+        ids = self.search('/api/projects/projects/', 'redesign', ordering='name')
+        self.assertEqual(ids, [self.beta.id, self.alpha.id])
+        self.assertEqual(self.search('/api/tasks/tasks/', '"migration OR*'), [])
+        self.assertEqual(self.search('/api/tasks/tasks/', 'migration', cursor=''), [self.task.id])
+
+    def test_cursor_pages_keep_the_rank_order(self):
+        newest = Project.objects.create(name='Redesign', description='Redesign the redesign')
+        ranked = self.search('/api/projects/projects/', 'redesig')
+        self.assertEqual(ranked, [newest.id, self.alpha.id, self.beta.id])
+        ids, url, params = [], '/api/projects/projects/', {'search': 'redesig', 'cursor': ''}
+        with mock.patch('core.pagination.KeysetPagination.page_size', 1):
+            while url:
+                body = self.client.get(url, params).json()
+                ids.extend(row['id'] for row in body['results'])
+                url, params = body['next'], {}
+        self.assertEqual(ids, ranked)
+
+    def search_time(self, term, matches, **params):
+        # Best of three timings of a search hitting `matches` tasks
+        Task.objects.bulk_create([Task(title=f'{term} {i}', project=self.beta) for i in range(matches)])
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            self.assertEqual(self.client.get('/api/tasks/tasks/', {'search': term, **params}).status_code, 200)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    def test_ranked_search_cost_grows_linearly(self):
+        for params in ({}, {'cursor': ''}):
+            small = self.search_time(f'small{len(params)}', 1000, **params)
+            large = self.search_time(f'large{len(params)}', 4000, **params)
+            # 4x the matches: linear plus the sort stays well under the 16x
+            # of ranking each row with its own MATCH
+            self.assertLess(large, small * 8, params)
+
+        # Nor does a cursor page filter on a per-row MATCH
+        next_page = self.client.get('/api/tasks/tasks/', {'search': 'small', 'cursor': ''}).json()['next']
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(next_page)
+        for query in context.captured_queries:
+            self.assertNotIn('CORRELATED', ' '.join(explain(query['sql'])))
+
+
+class CalendarEventsTests(QueryPlanAssertions, TestCase):
+    url = '/api/calendar/events/'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('viewer', password='pass12345')
+        self.client.force_login(self.user)
+        self.project = Project.objects.create(
+            name='Launch', start_date=date(2025, 1, 20), estimated_completion_date=date(2025, 2, 10),
+            end_date=date(2025, 3, 15),
+        )
+        self.task = Task.objects.create(
+            title='Write copy', project=self.project, start_date=date(2025, 2, 1),
+            due_date=date(2025, 2, 28), completed_date=date(2025, 2, 27),
+        )
+        Task.objects.create(title='Later', project=self.project, due_date=date(2025, 6, 1))
+
+    def test_only_dates_inside_the_window(self):
+        body = self.client.get(self.url, {'start': '2025-02-01', 'end': '2025-03-01'}).json()
+        self.assertEqual(body['results'], [
+            {'kind': 'task_start', 'id': self.task.id, 'title': 'Write copy', 'date': '2025-02-01',
+             'project': self.project.id},
+            {'kind': 'project_due', 'id': self.project.id, 'title': 'Launch', 'date': '2025-02-10'},
+            {'kind': 'task_completed', 'id': self.task.id, 'title': 'Write copy', 'date': '2025-02-27',
+             'project': self.project.id},
+            {'kind': 'task_due', 'id': self.task.id, 'title': 'Write copy', 'date': '2025-02-28',
+             'project': self.project.id},
+        ])
+        # End is exclusive
+        body = self.client.get(self.url, {'start': '2025-03-01', 'end': '2025-03-15'}).json()
+        self.assertEqual(body['results'], [])
+
+    def test_window_queries_use_indexes(self):
+        for table in ('projects_project', 'tasks_task'):
+            self.assertRequestIndexed(self.url, {'start': '2025-02-01', 'end': '2025-03-01'}, table)
+
+    def test_invalid_windows(self):
+        for params in ({}, {'start': '2025-02-01'}, {'start': 'feb', 'end': '2025-03-01'},
+                       {'start': '2025-03-01', 'end': '2025-02-01'},
+                       {'start': '2025-01-01', 'end': '2026-06-01'}):
+            with self.subTest(**params):
+                self.assertEqual(self.client.get(self.url, params).status_code, 400)
+
+
+class TeamWorkloadTests(TestCase):
+    url = '/api/team/workload/'
+
+    def setUp(self):
+        cache.clear()
+        self.ann = User.objects.create_user('ann', first_name='Ann', password='pass12345')
+        self.bob = User.objects.create_user('bob', first_name='Bob', password='pass12345')
+        User.objects.create_user('gone', is_active=False)
+        alpha = Project.objects.create(name='Alpha')
+        beta = Project.objects.create(name='Beta')
+        alpha.team_members.add(self.ann, self.bob)
+        beta.team_members.add(self.ann)
+        Task.objects.create(title='A1', project=alpha, status='COMPLETED', estimated_hours=4, actual_hours=5)
+        Task.objects.create(title='A2', project=alpha, status='BLOCKED', estimated_hours=2, actual_hours=1)
+        Task.objects.create(title='B1', project=beta, estimated_hours=8)
+        self.client.force_login(self.ann)
+
+    def test_workload_per_active_user(self):
+        with self.assertNumQueries(2):
+            members = team_workload()
+        self.assertEqual([m['username'] for m in members], ['ann', 'bob'])
+        ann, bob = members
+        self.assertEqual(
+            (ann['projects'], ann['open_tasks'], ann['completed_tasks'], ann['estimated_hours'], ann['actual_hours']),
+            (2, 2, 1, 14.0, 6.0),
+        )
+        self.assertEqual(
+            (bob['projects'], bob['open_tasks'], bob['completed_tasks'], bob['estimated_hours'], bob['actual_hours']),
+            (1, 1, 1, 6.0, 6.0),
+        )
+
+    def test_endpoint(self):
+        body = self.client.get(self.url).json()
+        self.assertEqual(body['summary']['team_members'], 2)
+        self.assertEqual(body['summary']['total_tasks'], 3)
+        self.assertEqual(len(body['members']), 2)
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = ProjectCategory.objects.create(name='Client', description='Paid, work')
+        self.project = Project.objects.create(name='Alpha, "quoted"', category=category, budget='1200.50')
+        for i in range(7):
+            Task.objects.create(title=f'Task {i}', project=self.project,
+                                status='COMPLETED' if i % 2 else 'TODO', estimated_hours='1.25')
+
+    def stream(self, url, params=None):
+        response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_ndjson_matches_the_list_api(self):
+        listed = self.client.get('/api/tasks/tasks/', {'status': 'TODO', 'ordering': 'id'}).json()['results']
+        response, body = self.stream('/api/tasks/tasks/export/ndjson/', {'status': 'TODO', 'ordering': 'id'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([json.loads(line) for line in body.splitlines()], listed)
+
+    def test_csv_with_sparse_fields_and_nested_values(self):
+        response, body = self.stream('/api/projects/projects/export/csv/', {'fields': 'id,name,category,budget'})
+        self.assertIn('attachment; filename="project-', response['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0], ['id', 'name', 'category', 'budget'])
+        self.assertEqual(rows[1][1:3], ['Alpha, "quoted"', json.dumps(
+            {'id': self.project.category_id, 'name': 'Client', 'description': 'Paid, work'})])
+        self.assertEqual(rows[1][3], '1200.50')
+
+    def test_rows_are_streamed_in_chunks(self):
+        with mock.patch('core.export.EXPORT_CHUNK_SIZE', 2), mock.patch('core.export.EXPORT_BATCH_ROWS', 3):
+            response = self.client.get('/api/tasks/tasks/export/csv/')
+            chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), 3)  # header + 7 rows, in lines of 3
+        self.assertEqual(self.client.get('/api/tasks/tasks/export/csv/', {'status': 'bogus'}).status_code, 400)
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('export_data', 'tasks', '--format', 'ndjson', '--query', 'status=COMPLETED&fields=id,title',
+                     stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(set(rows[0]), {'id', 'title'})
+        with self.assertRaises(CommandError):
+            call_command('export_data', 'tasks', '--query', 'fields=nope', stdout=io.StringIO())
+
+
+class DeltaSyncTests(TestCase):
+    url = '/api/sync/'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('viewer', password='pass12345')
+        self.client.force_login(self.user)
+        self.project = Project.objects.create(name='Alpha')
+        self.tasks = [Task.objects.create(title=f'Task {i}', project=self.project) for i in range(3)]
+
+    def sync(self, token=None):
+        response = self.client.get(self.url, {'since': token} if token else {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_only_changes_since_the_token(self):
+        first = self.sync()
+        self.assertEqual([row['id'] for row in first['tasks']], [task.id for task in self.tasks])
+        self.assertEqual([row['id'] for row in first['projects']], [self.project.id])
+        self.assertFalse(first['has_more'])
+
+        unchanged = self.sync(first['token'])
+        self.assertEqual((unchanged['projects'], unchanged['tasks']), ([], []))
+
+        self.tasks[0].title = 'Renamed'
+        self.tasks[0].save()
+        deleted_id = self.tasks[1].id
+        self.tasks[1].delete()
+        changed = self.sync(unchanged['token'])
+        self.assertEqual([row['title'] for row in changed['tasks']], ['Renamed'])
+        # The rollup moved, so the project is reported with its new progress
+        self.assertEqual([row['id'] for row in changed['projects']], [self.project.id])
+        self.assertEqual(changed['deleted'], {'projects': [], 'tasks': [deleted_id]})
+
+    def test_pages_until_caught_up(self):
+        Task.objects.create(title='Task 3', project=self.project)
+        seen, token = [], None
+        with mock.patch('core.sync.SYNC_PAGE_SIZE', 3):
+            while True:
+                body = self.sync(token)
+                seen.extend(row['id'] for row in body['tasks'])
+                token = body['token']
+                if not body['has_more']:
+                    break
+        self.assertEqual(seen, sorted(Task.objects.values_list('id', flat=True)))
+
+    def test_bulk_and_cascade_deletes_are_logged(self):
+        self.client.delete('/api/tasks/tasks/bulk/?status=TODO&search=Task')
+        self.assertEqual(ChangeLog.objects.filter(model='task', deleted=True).count(), 3)
+        token = self.sync()['token']
+        project_id = self.project.id
+        self.project.delete()
+        self.assertEqual(self.sync(token)['deleted']['projects'], [project_id])
+
+    def test_category_changes_reach_their_projects(self):
+        category = ProjectCategory.objects.create(name='Ops')
+        self.project.category = category
+        self.project.save()
+        token = self.sync()['token']
+
+        category.name = 'Operations'
+        category.save()
+        changed = self.sync(token)
+        self.assertEqual([row['category']['name'] for row in changed['projects']], ['Operations'])
+
+        category.delete()
+        changed = self.sync(changed['token'])
+        self.assertEqual([row['category'] for row in changed['projects']], [None])
+
+    def test_position_stops_at_the_last_committed_entry(self):
+        token = self.sync()['token']
+        committed = ChangeLog.objects.order_by('id').last().id
+        # An entry numbered after the committed position is not read yet
+        self.tasks[0].save()
+        with mock.patch('core.sync.committed_position', return_value=committed):
+            held_back = self.sync(token)
+        self.assertEqual(held_back['tasks'], [])
+        self.assertEqual([row['id'] for row in self.sync(held_back['token'])['tasks']], [self.tasks[0].id])
+
+    def test_invalid_and_expired_tokens(self):
+        self.assertEqual(self.client.get(self.url, {'since': 'garbage'}).status_code, 400)
+        token = self.sync()['token']
+        with mock.patch('core.sync.CHANGELOG_RETENTION', timedelta(0)):
+            self.assertEqual(self.client.get(self.url, {'since': token}).status_code, 410)
+
+    def test_expiry_follows_the_oldest_entry_still_needed(self):
+        token = self.sync()['token']
+        _, since, _ = decode_token(token)
+        for task in self.tasks:
+            task.save()
+        # Reissued mid-backlog, the token still dates from the first entry it lacks
+        with mock.patch('core.sync.SYNC_PAGE_SIZE', 1):
+            paging = self.sync(token)
+        self.assertTrue(paging['has_more'])
+        self.assertEqual(decode_token(paging['token'])[1], since)
+
+        later = since + CHANGELOG_RETENTION - timedelta(hours=1)
+        with mock.patch('django.utils.timezone.now', return_value=later), self.assertRaises(TokenExpired):
+            decode_token(paging['token'])
+        # Once caught up it moves forward
+        caught_up = self.sync(paging['token'])
+        while caught_up['has_more']:
+            caught_up = self.sync(caught_up['token'])
+        self.assertGreater(decode_token(caught_up['token'])[1], since)
+
+
+# Enabled explicitly: without REDIS_URL the settings keep it off
+@override_settings(RESPONSE_CACHE_TIMEOUT=300)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = ProjectCategory.objects.create(name='Internal')
+        self.project = Project.objects.create(name='Alpha', category=self.category)
+        self.task = Task.objects.create(title='Write docs', project=self.project)
+
+    def get(self, url, params=None):
+        response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_hits_until_a_dependency_changes(self):
+        self.assertEqual(self.get('/api/tasks/tasks/')['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.get('/api/tasks/tasks/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        # Parameter order is normalized away
+        self.get('/api/tasks/tasks/', {'status': 'TODO', 'priority': 'MEDIUM'})
+        self.assertEqual(self.client.get('/api/tasks/tasks/?priority=MEDIUM&status=TODO')['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.title = 'Write the docs'
+            self.task.save()
+        response = self.get('/api/tasks/tasks/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['title'], 'Write the docs')
+
+    def test_invalidation_is_per_model(self):
+        self.get('/api/tasks/tasks/')
+        self.get(f'/api/projects/projects/{self.project.id}/')
+        self.get('/api/projects/project-categories/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Client'
+            self.category.save()
+        # Tasks do not read categories; projects and categories do
+        self.assertEqual(self.get('/api/tasks/tasks/')['X-Cache'], 'HIT')
+        response = self.get(f'/api/projects/projects/{self.project.id}/')
+        self.assertEqual((response['X-Cache'], response.json()['category']['name']), ('MISS', 'Client'))
+        self.assertEqual(self.get('/api/projects/project-categories/')['X-Cache'], 'MISS')
+
+        # Task writes move project progress, including bulk ones
+        self.get(f'/api/projects/projects/{self.project.id}/')
+        self.client.force_login(User.objects.create_user('editor', password='pass12345'))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/tasks/tasks/bulk/', [{'title': 'New', 'project': self.project.id}],
+                                        content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.get(f'/api/projects/projects/{self.project.id}/')['X-Cache'], 'MISS')
+
+    def test_stats(self):
+        for _ in range(3):
+            self.get('/api/projects/project-categories/')
+        self.assertEqual(response_cache_stats(['projectcategory'])['projectcategory'],
+                         {'hits': 2, 'misses': 1, 'hit_rate': 66.7})
+        out = io.StringIO()
+        call_command('response_cache_stats', stdout=out)
+        self.assertIn('projectcategory', out.getvalue())
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def test_can_be_disabled(self):
+        self.get('/api/tasks/tasks/')
+        self.assertFalse(self.get('/api/tasks/tasks/').has_header('X-Cache'))
+
+
+class BackgroundJobTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(name='Alpha')
+        Task.objects.create(title='Write docs', project=self.project, status='COMPLETED')
+
+    def test_jobs_run_eagerly_and_record_runtime(self):
+        Project.objects.filter(pk=self.project.pk).update(task_count=0, completed_task_count=0)
+
+        self.assertEqual(rebuild_rollups.delay([self.project.pk]).get(), 1)
+
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.task_count, self.project.completed_task_count), (1, 1))
+        stats = job_stats(['projects.tasks.rebuild_rollups'])['projects.tasks.rebuild_rollups']
+        self.assertEqual((stats['runs'], stats['succeeded'], stats['failed']), (1, 1, 0))
+        self.assertEqual(stats['last_outcome'], 'succeeded')
+        self.assertIsNotNone(stats['last_run'])
+
+    def test_database_errors_are_retried(self):
+        with mock.patch('projects.tasks.rebuild_task_rollups', side_effect=[OperationalError('locked'), 1]):
+            # As on a worker: eager runs only retry when errors are not propagated
+            self.assertEqual(rebuild_rollups.apply(throw=False).get(), 1)
+
+        stats = job_stats(['projects.tasks.rebuild_rollups'])['projects.tasks.rebuild_rollups']
+        self.assertEqual((stats['runs'], stats['retried'], stats['succeeded']), (2, 1, 1))
+
+    def test_other_errors_fail_without_retry(self):
+        with mock.patch('projects.tasks.rebuild_task_rollups', side_effect=ValueError) as rebuild:
+            result = rebuild_rollups.apply(throw=False)
+
+        self.assertIsInstance(result.result, ValueError)
+        self.assertEqual(rebuild.call_count, 1)
+        self.assertEqual(job_stats(['projects.tasks.rebuild_rollups'])['projects.tasks.rebuild_rollups']['failed'], 1)
+
+    def test_generate_reports_warms_shared_snapshots(self):
+        with mock.patch('core.cache.shared_cache', return_value=True):
+            generate_reports.delay()
+
+        with self.assertNumQueries(0):
+            get_snapshot('team-workload', lambda: self.fail('snapshot was not warmed'))
+
+    def test_generate_reports_skips_a_private_cache(self):
+        generate_reports.delay()
+
+        built = []
+        get_snapshot('team-workload', lambda: built.append('team-workload'))
+        self.assertEqual(built, ['team-workload'])
+
+    def test_stats_are_shared_through_the_database(self):
+        rebuild_rollups.delay()
+        cache.clear()
+
+        self.assertEqual(JobStat.objects.get(name='projects.tasks.rebuild_rollups').runs, 1)
+        self.assertEqual(job_stats(['projects.tasks.rebuild_rollups'])['projects.tasks.rebuild_rollups']['runs'], 1)
+
+    def test_export_dataset_writes_a_file(self):
+        with self.settings(EXPORT_ROOT=self.tmp_dir()):
+            path = export_dataset.delay('tasks', 'ndjson', 'fields=id,title').get()
+            with open(path, encoding='utf-8') as handle:
+                rows = [json.loads(line) for line in handle]
+        self.assertEqual(rows, [{'id': Task.objects.get().pk, 'title': 'Write docs'}])
+
+    def test_every_heavy_job_is_metered(self):
+        self.assertTrue({
+            'core.tasks.export_dataset', 'core.tasks.generate_reports', 'core.tasks.log_overdue_tasks',
+            'core.tasks.prune_changelog', 'projects.tasks.rebuild_rollups', 'users.tasks.notify_overdue',
+        } <= set(metered_jobs()))
+
+    def tmp_dir(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return directory.name
+
+
+class ReportTests(TestCase):
+    url = '/api/reports/'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('viewer', password='pass12345')
+        self.client.force_login(self.user)
+        self.category = ProjectCategory.objects.create(name='Internal')
+        self.alpha = Project.objects.create(
+            name='Alpha', category=self.category, budget=1000, current_spend=250,
+        )
+        self.beta = Project.objects.create(name='Beta', current_spend=40)
+        Task.objects.create(title='Spec', project=self.alpha, priority='HIGH', status='COMPLETED',
+                            estimated_hours=4, actual_hours=5)
+        Task.objects.create(title='Build', project=self.alpha, priority='HIGH', estimated_hours=10, actual_hours=2)
+        Task.objects.create(title='Ship', project=self.beta, priority='LOW', estimated_hours=1)
+
+    def rows(self, section):
+        return {row['key']: row for row in report_payload()[section]}
+
+    def test_full_refresh_builds_every_report(self):
+        self.assertEqual(refresh_reports(), 2)
+
+        payload = report_payload()
+        totals = payload['totals']
+        self.assertEqual((totals['projects'], totals['tasks'], totals['completed_tasks']), (2, 3, 1))
+        self.assertEqual((totals['budget'], totals['current_spend']), (1000.0, 290.0))
+        self.assertEqual((totals['estimated_hours'], totals['actual_hours']), (15.0, 7.0))
+        self.assertEqual(totals['completion_rate'], 33.3)
+
+        alpha = self.rows('projects')[str(self.alpha.pk)]
+        self.assertEqual((alpha['budget_used'], alpha['hours_variance'], alpha['completion_rate']), (25.0, -7.0, 50.0))
+        self.assertIsNone(self.rows('projects')[str(self.beta.pk)]['budget_used'])
+
+        categories = self.rows('by_category')
+        self.assertEqual(categories[str(self.category.pk)]['completion_rate'], 50.0)
+        self.assertEqual(categories['none']['label'], 'Uncategorized')
+        priorities = self.rows('by_priority')
+        self.assertEqual((priorities['HIGH']['tasks'], priorities['HIGH']['completed_tasks']), (2, 1))
+        self.assertEqual(priorities['CRITICAL']['tasks'], 0)
+        self.assertEqual(self.rows('by_status')['TODO']['share'], 66.7)
+
+    def test_refresh_only_reaggregates_changed_projects(self):
+        refresh_reports()
+        task = Task.objects.get(title='Ship')
+        task.status = 'COMPLETED'
+        task.save()
+
+        with mock.patch('core.reports.project_rows', wraps=project_rows) as rows:
+            self.assertEqual(refresh_reports(), 1)
+        rows.assert_called_once_with({self.beta.pk})
+        self.assertEqual(report_payload()['totals']['completed_tasks'], 2)
+
+        self.assertEqual(refresh_reports(), 0)
+
+    def test_deleted_projects_leave_the_reports(self):
+        refresh_reports()
+        self.beta.delete()
+
+        refresh_reports()
+
+        self.assertNotIn(str(self.beta.pk), self.rows('projects'))
+        self.assertEqual(report_payload()['totals']['projects'], 1)
+
+    def test_category_renames_and_deletes_reach_the_groups(self):
+        empty = ProjectCategory.objects.create(name='Empty')
+        refresh_reports()
+        empty.name = 'Still empty'
+        empty.save()
+        refresh_reports()
+        self.assertEqual(self.rows('by_category')[str(empty.pk)]['label'], 'Still empty')
+
+        self.category.delete()
+        refresh_reports()
+        categories = self.rows('by_category')
+        self.assertNotIn(str(self.category.pk), categories)
+        self.assertEqual(categories['none']['projects'], 2)
+
+    def test_unknown_category_ids_count_as_uncategorized(self):
+        rows = project_rows()
+        rows[self.alpha.pk]['category'] = self.category.pk + 100
+        categories = [row for row in group_rows(rows.values()) if row[0] == ReportRow.Report.CATEGORY]
+        self.assertEqual([(key, data['projects']) for _, key, _, data in categories if data['projects']], [('none', 2)])
+
+    def test_page_reads_stored_rows_only(self):
+        refresh_reports()
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['projects']), 2)
+        for query in context.captured_queries:
+            self.assertNotIn('"tasks_task"', query['sql'])
+            self.assertNotIn('"projects_project"', query['sql'])
+
+    def test_first_visit_builds_the_reports(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['totals']['projects'], 2)
+
+    def test_first_refresh_is_queued_once(self):
+        with mock.patch('project_tracker.views.generate_reports') as job:
+            self.client.get(self.url)
+            self.client.get(self.url)
+        self.assertEqual(job.delay.call_count, 1)
+
+    def test_failed_first_refresh_still_renders(self):
+        with mock.patch('core.tasks.refresh_reports', side_effect=OperationalError('locked')), \
+                self.assertLogs('project_tracker.views', 'ERROR'):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.json()['totals'])
+        # The lock is released, so the next visit tries again
+        self.assertEqual(self.client.get(self.url).json()['totals']['projects'], 2)
+
+
+class DatabaseProfileTests(SimpleTestCase):
+    base_dir = Path('/srv/tracker')
+
+    def test_sqlite_by_default(self):
+        config = database_settings({}, self.base_dir)
+        self.assertEqual(config, {'ENGINE': 'django.db.backends.sqlite3', 'NAME': self.base_dir / 'db.sqlite3'})
+
+    def test_postgres_keeps_checked_connections(self):
+        config = database_settings({
+            'DATABASE_ENGINE': 'postgresql', 'POSTGRES_DB': 'tracker', 'POSTGRES_HOST': 'db',
+            'DATABASE_CONN_MAX_AGE': '300',
+        }, self.base_dir)
+
+        self.assertEqual(config['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual((config['NAME'], config['HOST'], config['PORT']), ('tracker', 'db', '5432'))
+        self.assertEqual(config['CONN_MAX_AGE'], 300)
+        self.assertTrue(config['CONN_HEALTH_CHECKS'])
+        self.assertNotIn('pool', config['OPTIONS'])
+
+    def test_pool_modes(self):
+        with mock.patch('project_tracker.database.find_spec', return_value=object()):
+            pooled = database_settings({'DATABASE_ENGINE': 'postgresql', 'DATABASE_POOL': 'psycopg'}, self.base_dir)
+        self.assertEqual(pooled['CONN_MAX_AGE'], 0)
+        self.assertEqual(pooled['OPTIONS']['pool']['max_size'], 10)
+
+        bouncer = database_settings({'DATABASE_ENGINE': 'postgresql', 'DATABASE_POOL': 'pgbouncer'}, self.base_dir)
+        self.assertTrue(bouncer['DISABLE_SERVER_SIDE_CURSORS'])
+
+    def test_sqlite_performance_mode(self):
+        config = database_settings({'SQLITE_PERFORMANCE_MODE': '1', 'SQLITE_PATH': '/data/tracker.db'}, self.base_dir)
+
+        self.assertEqual(config['NAME'], '/data/tracker.db')
+        self.assertEqual(config['PRAGMAS']['journal_mode'], 'WAL')
+        self.assertEqual(config['OPTIONS'], {'transaction_mode': 'IMMEDIATE'})
+
+    def test_rejects_unknown_values(self):
+        with self.assertRaises(ImproperlyConfigured):
+            database_settings({'DATABASE_ENGINE': 'mysql'}, self.base_dir)
+        with self.assertRaises(ImproperlyConfigured):
+            database_settings({'DATABASE_ENGINE': 'postgresql', 'DATABASE_POOL': 'yes'}, self.base_dir)
+        with mock.patch('project_tracker.database.find_spec', return_value=None), \
+                self.assertRaisesMessage(ImproperlyConfigured, 'psycopg 3'):
+            database_settings({'DATABASE_ENGINE': 'postgresql', 'DATABASE_POOL': 'psycopg'}, self.base_dir)
+
+
+class SqlitePragmaTests(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_apply_to_new_connections(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite only')
+        for name in ('cache_size', 'busy_timeout'):
+            self.addCleanup(connection.cursor().execute, f'PRAGMA {name} = {self.pragma(name)}')
+
+        with mock.patch.dict(connection.settings_dict, {'PRAGMAS': {'cache_size': -12345, 'busy_timeout': 2500}}):
+            apply_pragmas(sender=None, connection=connection)
+
+        self.assertEqual(self.pragma('cache_size'), -12345)
+        self.assertEqual(self.pragma('busy_timeout'), 2500)
+
+    def test_optimize_only_runs_in_performance_mode(self):
+        self.assertIsNone(optimize_database())
+
+        with mock.patch.dict(connection.settings_dict, {'PRAGMAS': {'analysis_limit': 400}}):
+            statement = optimize_database()
+        if connection.vendor == 'sqlite':
+            self.assertIn(statement, ('ANALYZE', 'PRAGMA optimize = 0x10002'))
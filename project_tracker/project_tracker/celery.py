@@ -0,0 +1,26 @@
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_tracker.settings')
+
+app = Celery('project_tracker')
+
+# Every CELERY_* setting in settings.py configures the app
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Picks up tasks.py in each installed app
+app.autodiscover_tasks()
+
+
+@app.on_after_configure.connect
+def create_local_folders(sender, **kwargs):
+    # The filesystem broker and result backend do not create their folders
+    folders = [
+        value for option, value in (sender.conf.broker_transport_options or {}).items()
+        if option.endswith('_folder') or option.startswith('data_folder')
+    ]
+    if (sender.conf.result_backend or '').startswith('file://'):
+        folders.append(sender.conf.result_backend[len('file://'):])
+    for folder in folders:
+        os.makedirs(folder, exist_ok=True)
@@ -0,0 +1,135 @@
+"""
+DATABASES['default'] built from the environment.
+
+SQLite unless DATABASE_ENGINE=postgresql. SQLite reads:
+
+    SQLITE_PATH               database file (db.sqlite3 next to manage.py)
+    SQLITE_PERFORMANCE_MODE   1 to apply SQLITE_PRAGMAS to every connection
+                              and start write transactions immediately, for
+                              several workers sharing one file
+
+PostgreSQL reads:
+
+    POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD, POSTGRES_HOST, POSTGRES_PORT
+    DATABASE_CONN_MAX_AGE     seconds a connection is kept between requests (60)
+    DATABASE_CONNECT_TIMEOUT  seconds to wait for the server (5)
+    DATABASE_POOL             '' (persistent connections), 'psycopg' (Django's
+                              pool; refused unless psycopg 3 and psycopg-pool
+                              are installed: pip install "psycopg[binary,pool]")
+                              or 'pgbouncer' (behind PgBouncer transaction pooling)
+    DATABASE_POOL_MIN, DATABASE_POOL_MAX   pool bounds for 'psycopg' (2, 10)
+
+A throwaway local server is enough for the test suite and the benchmark:
+    docker run --rm -p 5432:5432 -e POSTGRES_PASSWORD=postgres postgres:16
+    DATABASE_ENGINE=postgresql POSTGRES_PASSWORD=postgres python manage.py test
+"""
+from importlib.util import find_spec
+
+from django.core.exceptions import ImproperlyConfigured
+
+POOL_MODES = ('', 'psycopg', 'pgbouncer')
+
+# Applied by apply_pragmas() when SQLITE_PERFORMANCE_MODE is on
+SQLITE_PRAGMAS = {
+    # Readers no longer block the writer, nor it them
+    'journal_mode': 'WAL',
+    # Under WAL only a power loss can drop the latest commits, never corrupt
+    'synchronous': 'NORMAL',
+    # Wait up to 5s for the write lock instead of failing with "database is locked"
+    'busy_timeout': 5000,
+    # 64 MB page cache (negative means KiB) and 256 MB of memory-mapped reads
+    'cache_size': -64000,
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY',
+    # Bounds the work of ANALYZE / PRAGMA optimize on large tables
+    'analysis_limit': 400,
+}
+
+
+def database_settings(environ, base_dir):
+    engine = environ.get('DATABASE_ENGINE', 'sqlite')
+    if engine == 'sqlite':
+        config = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': environ.get('SQLITE_PATH') or base_dir / 'db.sqlite3',
+        }
+        if environ.get('SQLITE_PERFORMANCE_MODE') == '1':
+            config['PRAGMAS'] = SQLITE_PRAGMAS
+            # Take the write lock at BEGIN: a deferred transaction that has
+            # to upgrade from reading fails at once instead of waiting
+            config['OPTIONS'] = {'transaction_mode': 'IMMEDIATE'}
+        return config
+    if engine not in ('postgresql', 'postgres'):
+        raise ImproperlyConfigured(f'DATABASE_ENGINE must be sqlite or postgresql, not {engine!r}')
+
+    pool = environ.get('DATABASE_POOL', '')
+    if pool not in POOL_MODES:
+        raise ImproperlyConfigured(f'DATABASE_POOL must be one of {POOL_MODES}, not {pool!r}')
+
+    config = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': environ.get('POSTGRES_DB', 'project_tracker'),
+        'USER': environ.get('POSTGRES_USER', 'postgres'),
+        'PASSWORD': environ.get('POSTGRES_PASSWORD', ''),
+        'HOST': environ.get('POSTGRES_HOST', 'localhost'),
+        'PORT': environ.get('POSTGRES_PORT', '5432'),
+        # Reuse a worker's connection across requests instead of paying the
+        # connect + auth round trips each time; a dead one is replaced on
+        # first use thanks to the health check
+        'CONN_MAX_AGE': int(environ.get('DATABASE_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'connect_timeout': int(environ.get('DATABASE_CONNECT_TIMEOUT', 5)),
+            'application_name': 'project_tracker',
+        },
+    }
+    if pool == 'psycopg':
+        # Checked here: with psycopg2 Django would only fail on first connect
+        if find_spec('psycopg') is None or find_spec('psycopg_pool') is None:
+            raise ImproperlyConfigured(
+                'DATABASE_POOL=psycopg needs psycopg 3 and psycopg-pool '
+                '(pip install "psycopg[binary,pool]"); unset it to use persistent connections'
+            )
+        # The pool replaces persistent connections; Django rejects both at once
+        config['CONN_MAX_AGE'] = 0
+        config['OPTIONS']['pool'] = {
+            'min_size': int(environ.get('DATABASE_POOL_MIN', 2)),
+            'max_size': int(environ.get('DATABASE_POOL_MAX', 10)),
+            'timeout': 10,
+        }
+    elif pool == 'pgbouncer':
+        # Each transaction may land on a different server connection, so
+        # cursors cannot outlive one (exports and sync use .iterator())
+        config['DISABLE_SERVER_SIDE_CURSORS'] = True
+    return config
+
+
+def apply_pragmas(sender, connection, **kwargs):
+    """
+    connection_created receiver applying the database's PRAGMAS setting
+    """
+    pragmas = connection.settings_dict.get('PRAGMAS')
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def optimize_database(using='default'):
+    """
+    Refresh the query planner statistics of a tuned SQLite database. Newer
+    SQLite does this through PRAGMA optimize; older ones only optimize the
+    tables the current connection has queried, so they get ANALYZE instead
+    (bounded by analysis_limit). Returns the statement run, or None when
+    the database is not a tuned SQLite one.
+    """
+    from django.db import connections
+
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or not connection.settings_dict.get('PRAGMAS'):
+        return None
+    statement = 'PRAGMA optimize = 0x10002' if connection.Database.sqlite_version_info >= (3, 46) else 'ANALYZE'
+    with connection.cursor() as cursor:
+        cursor.execute(statement)
+    return statement
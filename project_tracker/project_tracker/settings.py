@@ -10,8 +10,13 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from celery.schedules import crontab
+
+from .database import database_settings
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -84,15 +89,104 @@ WSGI_APPLICATION = 'project_tracker.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# SQLite unless DATABASE_ENGINE=postgresql; see project_tracker/database.py
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_settings(os.environ, BASE_DIR),
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Local memory by default; set REDIS_URL to share snapshots between workers
+
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'project-tracker',
+        }
+    }
+
+# Pub/sub used to push live dashboard updates to server-sent event streams
+EVENT_BROKER = 'core.events.RedisBroker' if REDIS_URL else 'core.events.InProcessBroker'
+
+# Upper bound (seconds) for versioned snapshots such as the dashboard payload
+SNAPSHOT_CACHE_TIMEOUT = 300
+
+# Viewset list/retrieve responses (core.mixins.ResponseCacheMixin); 0 disables.
+# Invalidation bumps generations in the cache itself, so a per-process cache
+# would leave the other workers serving stale pages: shared caches only.
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 300 if REDIS_URL else 0
+
+
+# Background jobs (project_tracker/celery.py)
+# https://docs.celeryq.dev/en/stable/django/first-steps-with-django.html
+# Broker is CELERY_BROKER_URL, else REDIS_URL. CELERY_BROKER_URL=filesystem://
+# queues jobs under celery-broker/ for a worker on the same machine. With no
+# broker at all, jobs run eagerly inside the caller, as they do in tests.
+
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', REDIS_URL)
+CELERY_TASK_ALWAYS_EAGER = os.environ.get('CELERY_TASK_ALWAYS_EAGER', '0' if CELERY_BROKER_URL else '1') == '1'
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', REDIS_URL)
+
+if CELERY_BROKER_URL == 'filesystem://':
+    CELERY_BROKER_FOLDER = BASE_DIR / 'celery-broker'
+    CELERY_BROKER_TRANSPORT_OPTIONS = {
+        'data_folder_in': str(CELERY_BROKER_FOLDER / 'queue'),
+        'data_folder_out': str(CELERY_BROKER_FOLDER / 'queue'),
+        'processed_folder': str(CELERY_BROKER_FOLDER / 'processed'),
+        'control_folder': str(CELERY_BROKER_FOLDER / 'control'),
+    }
+    CELERY_RESULT_BACKEND = CELERY_RESULT_BACKEND or f'file://{CELERY_BROKER_FOLDER / "results"}'
+
+CELERY_TIMEZONE = 'UTC'
+CELERY_TASK_TRACK_STARTED = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1  # jobs are long; don't hoard them
+
+CELERY_BEAT_SCHEDULE = {
+    'log-overdue-tasks': {
+        'task': 'core.tasks.log_overdue_tasks',
+        'schedule': crontab(minute=5),
+    },
+    'notify-overdue': {
+        'task': 'users.tasks.notify_overdue',
+        'schedule': crontab(hour=7, minute=0),
+    },
+    'generate-reports': {
+        'task': 'core.tasks.generate_reports',
+        'schedule': crontab(),
+    },
+    'rebuild-reports': {
+        'task': 'core.tasks.generate_reports',
+        'schedule': crontab(hour=4, minute=0),
+        'kwargs': {'full': True},
+    },
+    'rebuild-rollups': {
+        'task': 'projects.tasks.rebuild_rollups',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'optimize-sqlite': {
+        'task': 'core.tasks.optimize_sqlite',
+        'schedule': crontab(minute=45),
+    },
+    'prune-changelog': {
+        'task': 'core.tasks.prune_changelog',
+        'schedule': crontab(hour=3, minute=30),
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -154,6 +248,9 @@ MEDIA_URL = '/media/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_ROOT = BASE_DIR / 'mediafiles'
 
+# Files written by core.tasks.export_dataset
+EXPORT_ROOT = MEDIA_ROOT / 'exports'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
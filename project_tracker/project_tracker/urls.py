@@ -48,6 +48,7 @@ urlpatterns = [
     # Dashboard
     path('dashboard/', views.dashboard, name='dashboard'),
     path('api/dashboard/data/', views.dashboard_data, name='dashboard_data'),
+    path('api/dashboard/stream/', views.dashboard_stream, name='dashboard_stream'),
     
     # Page routes
     path('projects/', views.projects, name='projects'),
@@ -65,6 +66,11 @@ urlpatterns = [
     path('api/projects/', include('projects.urls')),
     path('api/tasks/', include('tasks.urls')),
     path('api/recent-activity/', views.recent_activity, name='recent-activity'),
+    path('api/stats/completions/', views.completion_stats, name='completion-stats'),
+    path('api/calendar/events/', views.calendar_event_feed, name='calendar-events'),
+    path('api/team/workload/', views.team_workload_data, name='team-workload'),
+    path('api/sync/', views.sync_changes, name='sync'),
+    path('api/reports/', views.report_data, name='report-data'),
 
     #  Documentations
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
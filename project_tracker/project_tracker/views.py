@@ -1,12 +1,16 @@
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from asgiref.sync import sync_to_async
 from projects.models import Project
 from tasks.models import Task
 from django.utils import timezone
 from datetime import datetime, timedelta
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import require_GET, require_http_methods
 import json
+import logging
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from django.utils.timesince import timesince
@@ -14,6 +18,19 @@ from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404
 from projects.models import Project
 from django.contrib.auth.decorators import login_required
+from core.stats import project_counters, task_counters, bucket_count, completion_rate, completion_series, team_workload, BUCKETS
+from django.utils.dateparse import parse_date
+from django.core.cache import cache
+from core.cache import get_snapshot, conditional_on_data_version
+from core.events import get_broker
+from core.activity import feed_page, DEFAULT_FEED_SIZE, MAX_FEED_SIZE
+from core.calendar import calendar_events, MAX_CALENDAR_DAYS
+from core.sync import changes_since, TokenExpired
+from core.reports import report_payload
+from core.tasks import generate_reports
+from core.models import ActivityEvent
+
+logger = logging.getLogger(__name__)
 
 @login_required
 def home(request):
@@ -27,71 +44,38 @@ def landing(request):
 def dashboard(request):
     """Interactive dashboard with real-time data and charts"""
     try:
-        # Get current date and calculate date ranges
         today = timezone.now().date()
-        week_ago = today - timedelta(days=7)
-        month_ago = today - timedelta(days=30)
-        
-        # Get project statistics
-        total_projects = Project.objects.count()
-        active_projects = Project.objects.filter(status='IN_PROGRESS').count()
-        completed_projects = Project.objects.filter(status='COMPLETED').count()
-        overdue_projects = Project.objects.filter(
-            estimated_completion_date__lt=today,
-            status__in=['PLANNING', 'IN_PROGRESS']
-        ).count()
-        
-        # Get task statistics
-        total_tasks = Task.objects.count()
-        completed_tasks = Task.objects.filter(status='COMPLETED').count()
-        pending_tasks = Task.objects.filter(status='TODO').count()
-        overdue_tasks = Task.objects.filter(
-            due_date__lt=today,
-            status__in=['TODO', 'IN_PROGRESS']
-        ).count()
-        
+
+        # Project and task counters, one aggregate query per table
+        project_stats = project_counters(today)
+        task_stats = task_counters(today)
+
+        total_projects = project_stats['total']
+        active_projects = project_stats['by_status']['IN_PROGRESS']
+        completed_projects = project_stats['by_status']['COMPLETED']
+        overdue_projects = project_stats['overdue']
+
+        total_tasks = task_stats['total']
+        completed_tasks = task_stats['by_status']['COMPLETED']
+        pending_tasks = task_stats['by_status']['TODO']
+        overdue_tasks = task_stats['overdue']
+
         # Get recent projects
         recent_projects = Project.objects.order_by('-created_at')[:5]
         
         # Get recent tasks
         recent_tasks = Task.objects.select_related('project').order_by('-created_at')[:10]
         
-        # Get tasks by status for chart
-        tasks_by_status = {
-            'TODO': Task.objects.filter(status='TODO').count(),
-            'IN_PROGRESS': Task.objects.filter(status='IN_PROGRESS').count(),
-            'REVIEW': Task.objects.filter(status='REVIEW').count(),
-            'COMPLETED': Task.objects.filter(status='COMPLETED').count(),
-            'BLOCKED': Task.objects.filter(status='BLOCKED').count(),
-        }
-        
-        # Get projects by status for chart
-        projects_by_status = {
-            'PLANNING': Project.objects.filter(status='PLANNING').count(),
-            'IN_PROGRESS': Project.objects.filter(status='IN_PROGRESS').count(),
-            'ON_HOLD': Project.objects.filter(status='ON_HOLD').count(),
-            'COMPLETED': Project.objects.filter(status='COMPLETED').count(),
-            'CANCELLED': Project.objects.filter(status='CANCELLED').count(),
-        }
+        # Status breakdowns for charts
+        tasks_by_status = task_stats['by_status']
+        projects_by_status = project_stats['by_status']
         
         # Calculate completion rates
-        project_completion_rate = (completed_projects / total_projects * 100) if total_projects > 0 else 0
-        task_completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+        project_completion_rate = completion_rate(completed_projects, total_projects)
+        task_completion_rate = completion_rate(completed_tasks, total_tasks)
         
-        # Get weekly progress data
-        weekly_data = []
-        for i in range(7):
-            date = today - timedelta(days=i)
-            tasks_completed = Task.objects.filter(
-                completed_date=date,
-                status='COMPLETED'
-            ).count()
-            weekly_data.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'day': date.strftime('%a'),
-                'completed': tasks_completed
-            })
-        weekly_data.reverse()
+        # Weekly progress data
+        weekly_data = completion_series(today - timedelta(days=6), today)
         
         context = {
             'total_projects': total_projects,
@@ -106,8 +90,8 @@ def dashboard(request):
             'recent_tasks': recent_tasks,
             'tasks_by_status': tasks_by_status,
             'projects_by_status': projects_by_status,
-            'project_completion_rate': round(project_completion_rate, 1),
-            'task_completion_rate': round(task_completion_rate, 1),
+            'project_completion_rate': project_completion_rate,
+            'task_completion_rate': task_completion_rate,
             'weekly_data': weekly_data,
         }
         
@@ -170,56 +154,64 @@ def project_detail(request, project_id):
     project = get_object_or_404(Project, id=project_id)
     return render(request, 'project_detail.html', {'project': project})
 
+def build_dashboard_payload(today):
+    """Compute the dashboard_data payload from the database"""
+    # Get real-time statistics, one aggregate query per table
+    project_stats = project_counters(today)
+    task_stats = task_counters(today)
+    total_projects = project_stats['total']
+    active_projects = project_stats['by_status']['IN_PROGRESS']
+    total_tasks = task_stats['total']
+    completed_tasks = task_stats['by_status']['COMPLETED']
+    team_members = User.objects.filter(is_active=True).count()
+    # Get recent activity
+    recent_projects = Project.objects.order_by('-created_at')[:3]
+    recent_tasks = Task.objects.select_related('project').order_by('-created_at')[:5]
+    return {
+        'total_projects': total_projects,
+        'active_projects': active_projects,
+        'total_tasks': total_tasks,
+        'completed_tasks': completed_tasks,
+        'overdue_projects': project_stats['overdue'],
+        'overdue_tasks': task_stats['overdue'],
+        'team_members': team_members,
+        'project_completion_rate': completion_rate(active_projects, total_projects),
+        'task_completion_rate': completion_rate(completed_tasks, total_tasks),
+        'recent_projects': [
+            {
+                'id': p.id,
+                'name': p.name,
+                'status': p.status,
+                'progress': p.calculate_progress()
+            } for p in recent_projects
+        ],
+        'recent_tasks': [
+            {
+                'id': t.id,
+                'title': t.title,
+                'status': t.status,
+                'project_name': t.project.name
+            } for t in recent_tasks
+        ]
+    }
+
+def dashboard_snapshot():
+    """Dashboard payload for the current data version, built at most once per write"""
+    today = timezone.now().date()
+    return get_snapshot('dashboard', lambda: build_dashboard_payload(today), today)
+
 @csrf_exempt
 @require_http_methods(["GET"])
 @login_required
+@conditional_on_data_version
 def dashboard_data(request):
     """API endpoint for dashboard data updates"""
     try:
         if request.method == 'GET':
-            # Get real-time statistics
-            total_projects = Project.objects.count()
-            active_projects = Project.objects.filter(status='IN_PROGRESS').count()
-            total_tasks = Task.objects.count()
-            completed_tasks = Task.objects.filter(status='COMPLETED').count()
-            overdue_projects = Project.objects.filter(estimated_completion_date__lt=timezone.now().date(), status__in=['PLANNING', 'IN_PROGRESS']).count()
-            overdue_tasks = Task.objects.filter(due_date__lt=timezone.now().date(), status__in=['TODO', 'IN_PROGRESS']).count()
-            team_members = User.objects.filter(is_active=True).count()
-            # Get recent activity
-            recent_projects = Project.objects.order_by('-created_at')[:3]
-            recent_tasks = Task.objects.select_related('project').order_by('-created_at')[:5]
-            # Calculate completion rates
-            project_completion_rate = (active_projects / total_projects * 100) if total_projects > 0 else 0
-            task_completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+            # Served from the versioned snapshot until a Project/Task write
             return JsonResponse({
                 'success': True,
-                'data': {
-                    'total_projects': total_projects,
-                    'active_projects': active_projects,
-                    'total_tasks': total_tasks,
-                    'completed_tasks': completed_tasks,
-                    'overdue_projects': overdue_projects,
-                    'overdue_tasks': overdue_tasks,
-                    'team_members': team_members,
-                    'project_completion_rate': round(project_completion_rate, 1),
-                    'task_completion_rate': round(task_completion_rate, 1),
-                    'recent_projects': [
-                        {
-                            'id': p.id,
-                            'name': p.name,
-                            'status': p.status,
-                            'progress': p.calculate_progress()
-                        } for p in recent_projects
-                    ],
-                    'recent_tasks': [
-                        {
-                            'id': t.id,
-                            'title': t.title,
-                            'status': t.status,
-                            'project_name': t.project.name
-                        } for t in recent_tasks
-                    ]
-                },
+                'data': dashboard_snapshot(),
                 'timestamp': timezone.now().isoformat()
             })
     except Exception as e:
@@ -243,66 +235,198 @@ def dashboard_data(request):
         }, status=500)
     return JsonResponse({'error': 'Invalid request method'}, status=400)
     
-@api_view(['GET'])
+# Seconds between keep-alive comments on an idle event stream
+STREAM_KEEPALIVE = 15
+
+def sse_message(event, data):
+    return f'event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'
+
+async def dashboard_events():
+    """
+    Push a dashboard snapshot on connect, then an activity delta plus a fresh
+    snapshot whenever a Project/Task write is published
+    """
+    snapshot = sync_to_async(dashboard_snapshot)
+    async with get_broker().subscribe() as subscription:
+        yield sse_message('dashboard', await snapshot())
+        while True:
+            event = await subscription.get(timeout=STREAM_KEEPALIVE)
+            if event is None:
+                yield ': keepalive\n\n'
+                continue
+            # Coalesce bursts of writes into a single snapshot
+            for change in [event, *await subscription.drain()]:
+                yield sse_message('activity', change)
+            yield sse_message('dashboard', await snapshot())
+
+@require_GET
+async def dashboard_stream(request):
+    """Server-sent events stream for live dashboard updates"""
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+    if not isinstance(request, ASGIRequest):
+        # A sync worker would have to buffer the endless stream; 204 tells
+        # EventSource not to reconnect so the page falls back to polling
+        return HttpResponse(status=204)
+    response = StreamingHttpResponse(dashboard_events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+# How each kind of activity event is presented in the feed
+ACTIVITY_DISPLAY = {
+    ActivityEvent.Kind.PROJECT_CREATED: ('fa-plus', 'info', 'New project "{subject}" created', 'Project created'),
+    ActivityEvent.Kind.PROJECT_COMPLETED: ('fa-check', 'success', 'Project "{subject}" completed', 'Project marked as completed'),
+    ActivityEvent.Kind.TASK_CREATED: ('fa-plus', 'info', 'New task "{subject}" created', 'Added to project "{project_name}"'),
+    ActivityEvent.Kind.TASK_COMPLETED: ('fa-check', 'success', 'Task "{subject}" completed', 'Completed in project "{project_name}"'),
+    ActivityEvent.Kind.TASK_OVERDUE: ('fa-exclamation', 'warning', 'Task "{subject}" is overdue', 'Due date was {detail}'),
+}
+
 @login_required
+@api_view(['GET'])
+@conditional_on_data_version
 def recent_activity(request):
-    activities = []
-    now = timezone.now()
+    """
+    Activity feed, newest first; pass the returned `next` cursor as ?cursor=
+    to continue
+    """
+    try:
+        limit = min(int(request.query_params.get('limit', DEFAULT_FEED_SIZE)), MAX_FEED_SIZE)
+        events, next_cursor = feed_page(request.query_params.get('cursor'), max(limit, 1))
+    except ValueError:
+        return Response({'error': 'Invalid cursor or limit'}, status=400)
 
-    # Recent completed projects
-    completed_projects = Project.objects.filter(status='COMPLETED').order_by('-updated_at')[:2]
-    for project in completed_projects:
+    now = timezone.now()
+    activities = []
+    for event in events:
+        icon, icon_color, title, description = ACTIVITY_DISPLAY[event.kind]
+        fields = {'subject': event.subject, 'project_name': event.project_name, 'detail': event.detail}
         activities.append({
-            'icon': 'fa-check',
-            'icon_color': 'success',
-            'title': f'Project "{project.name}" completed',
-            'description': 'Project marked as completed',
-            'time_ago': timesince(project.updated_at, now) + ' ago' if project.updated_at else ''
+            'id': event.id,
+            'kind': event.kind,
+            'icon': icon,
+            'icon_color': icon_color,
+            'title': title.format(**fields),
+            'description': description.format(**fields),
+            'created_at': event.created_at,
+            'time_ago': timesince(event.created_at, now) + ' ago'
         })
 
-    # Recent overdue tasks
-    overdue_tasks = Task.objects.filter(status__in=['TODO', 'IN_PROGRESS'], due_date__lt=now.date()).order_by('-due_date')[:2]
-    for task in overdue_tasks:
-        activities.append({
-            'icon': 'fa-exclamation',
-            'icon_color': 'warning',
-            'title': f'Task "{task.title}" is overdue',
-            'description': f'Due date was {task.due_date}',
-            'time_ago': timesince(task.due_date, now.date()) + ' ago' if task.due_date else ''
-        })
+    return Response({'next': next_cursor, 'results': activities})
 
-    # Recent created projects
-    new_projects = Project.objects.order_by('-created_at')[:2]
-    for project in new_projects:
-        activities.append({
-            'icon': 'fa-plus',
-            'icon_color': 'info',
-            'title': f'New project "{project.name}" created',
-            'description': f'Project created',
-            'time_ago': timesince(project.created_at, now) + ' ago' if project.created_at else ''
-        })
+# Upper bound on the number of buckets a single completions request may ask for
+MAX_COMPLETION_BUCKETS = 1000
 
-    # Recent completed tasks
-    completed_tasks = Task.objects.filter(status='COMPLETED').order_by('-completed_date')[:2]
-    for task in completed_tasks:
-        activities.append({
-            'icon': 'fa-check',
-            'icon_color': 'success',
-            'title': f'Task "{task.title}" completed',
-            'description': f'Completed in project "{task.project.name}"' if task.project else 'Task completed',
-            'time_ago': timesince(task.completed_date, now.date()) + ' ago' if task.completed_date else ''
-        })
+@login_required
+@api_view(['GET'])
+def completion_stats(request):
+    """
+    Completed tasks per bucket, e.g. /api/stats/completions/?start=2025-01-01&end=2025-12-31&bucket=week
+    """
+    today = timezone.now().date()
+    bucket = request.query_params.get('bucket', 'day')
+    if bucket not in BUCKETS:
+        return Response({'error': f'bucket must be one of {", ".join(BUCKETS)}'}, status=400)
+    try:
+        # Absent parameters take the defaults; present but malformed ones are an error
+        end = parse_date(request.query_params.get('end') or today.isoformat())
+        start = parse_date(request.query_params.get('start') or (end - timedelta(days=6)).isoformat())
+    except (ValueError, TypeError, OverflowError):
+        start = end = None
+    if start is None or end is None:
+        return Response({'error': 'start and end must be valid YYYY-MM-DD dates'}, status=400)
+    if start > end:
+        return Response({'error': 'start must not be after end'}, status=400)
+    if bucket_count(start, end, bucket) > MAX_COMPLETION_BUCKETS:
+        return Response({'error': f'at most {MAX_COMPLETION_BUCKETS} buckets per request'}, status=400)
+
+    return Response({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'bucket': bucket,
+        'results': completion_series(start, end, bucket),
+    })
+
+@login_required
+@api_view(['GET'])
+@conditional_on_data_version
+def calendar_event_feed(request):
+    """
+    Project and task dates inside a window, e.g. /api/calendar/events/?start=2025-01-01&end=2025-02-01
+    (end exclusive, as sent by the calendar widget)
+    """
+    try:
+        start = parse_date(request.query_params.get('start', ''))
+        end = parse_date(request.query_params.get('end', ''))
+    except ValueError:
+        start = end = None
+    if start is None or end is None:
+        return Response({'error': 'start and end must be valid YYYY-MM-DD dates'}, status=400)
+    if start >= end:
+        return Response({'error': 'start must be before end'}, status=400)
+    if (end - start).days > MAX_CALENDAR_DAYS:
+        return Response({'error': f'at most {MAX_CALENDAR_DAYS} days per request'}, status=400)
+
+    return Response({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'results': calendar_events(start, end),
+    })
+
+@login_required
+@api_view(['GET'])
+@conditional_on_data_version
+def team_workload_data(request):
+    """
+    Team page payload: headline counters plus every active user's workload
+    """
+    dashboard = dashboard_snapshot()
+    return Response({
+        'summary': {
+            'team_members': dashboard['team_members'],
+            'active_projects': dashboard['active_projects'],
+            'total_tasks': dashboard['total_tasks'],
+            'task_completion_rate': dashboard['task_completion_rate'],
+        },
+        'members': get_snapshot('team-workload', team_workload),
+    })
 
-    # Sort all activities by their most recent timestamp (descending)
-    def get_time(activity):
-        # Try to get the most recent timestamp from the activity
-        for field in ['updated_at', 'created_at', 'due_date', 'completed_date']:
-            if field in activity and activity[field]:
-                return activity[field]
-        return None
+@login_required
+@api_view(['GET'])
+def sync_changes(request):
+    """
+    Delta sync: rows created/updated and ids deleted since ?since=<token>.
+    Call again with the returned token; repeat at once while has_more is true.
+    """
+    try:
+        return Response(changes_since(request.query_params.get('since') or None))
+    except TokenExpired as exc:
+        return Response({'error': str(exc)}, status=410)
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=400)
 
-    # Sort by time_ago (most recent first, since timesince returns strings, keep order as appended)
-    # Limit to 5 most recent
-    activities = activities[:5]
+# Held while the first report refresh is queued or running
+FIRST_REPORT_LOCK_KEY = 'core:reports:first-refresh'
+FIRST_REPORT_LOCK_SECONDS = 60
 
-    return Response(activities) 
\ No newline at end of file
+@login_required
+@api_view(['GET'])
+def report_data(request):
+    """
+    Reports page payload, read from the precomputed report rows. They are
+    refreshed by the generate_reports job, never by a page view.
+    """
+    payload = report_payload()
+    # Nothing built yet: queue the first refresh (runs inline without a broker),
+    # once per lock period rather than once per visit
+    if payload['refreshed_at'] is None and cache.add(FIRST_REPORT_LOCK_KEY, True, timeout=FIRST_REPORT_LOCK_SECONDS):
+        try:
+            generate_reports.delay()
+        except Exception:
+            # The page still renders, empty; the next visit tries again
+            logger.exception('Could not queue the first report refresh')
+            cache.delete(FIRST_REPORT_LOCK_KEY)
+        else:
+            payload = report_payload()
+    return Response(payload)
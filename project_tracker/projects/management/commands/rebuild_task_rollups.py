@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from projects.rollups import rebuild_task_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-project task counts from the tasks table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project', type=int, action='append', dest='projects',
+            help='Only rebuild the given project id (can be repeated)'
+        )
+
+    def handle(self, *args, **options):
+        corrected = rebuild_task_rollups(options['projects'])
+        self.stdout.write(self.style.SUCCESS(f'Corrected task rollups of {corrected} project(s)'))
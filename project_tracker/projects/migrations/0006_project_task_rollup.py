@@ -0,0 +1,45 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:54
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_task_rollup(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    Task = apps.get_model('tasks', 'Task')
+    counts = (
+        Task.objects.filter(project=OuterRef('pk'))
+        .order_by()
+        .values('project')
+        .annotate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status='COMPLETED')),
+        )
+    )
+    Project.objects.update(
+        task_count=Coalesce(Subquery(counts.values('total'), output_field=IntegerField()), Value(0)),
+        completed_task_count=Coalesce(Subquery(counts.values('completed'), output_field=IntegerField()), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_remove_project_owner'),
+        ('tasks', '0004_remove_task_owner'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='completed_task_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='task_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_task_rollup, migrations.RunPython.noop),
+    ]
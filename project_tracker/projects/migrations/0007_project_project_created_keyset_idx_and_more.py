@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_project_task_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['created_at', 'id'], name='project_created_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['start_date', 'id'], name='project_start_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['end_date', 'id'], name='project_end_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_project_project_created_keyset_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='project_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['priority', 'created_at', 'id'], name='project_priority_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['category', 'created_at', 'id'], name='project_category_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', 'estimated_completion_date'], name='project_status_deadline_idx'),
+        ),
+    ]
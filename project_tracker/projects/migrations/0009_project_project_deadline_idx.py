@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0008_project_project_status_created_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['estimated_completion_date'], name='project_deadline_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0009_project_project_deadline_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['updated_at', 'id'], name='project_sync_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0010_project_project_sync_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='project',
+            name='project_sync_idx',
+        ),
+    ]
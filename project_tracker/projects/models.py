@@ -61,19 +61,35 @@ class Project(models.Model):
     budget = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     current_spend = models.DecimalField(max_digits=12, decimal_places=2, default=0)
 
+    # Task Rollup (maintained by tasks.signals, rebuilt by rebuild_task_rollups)
+    task_count = models.PositiveIntegerField(default=0, editable=False)
+    completed_task_count = models.PositiveIntegerField(default=0, editable=False)
+
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    ROLLUP_FIELDS = ('task_count', 'completed_task_count')
+
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Rollup columns are only ever written through F() updates, so never
+        # let a stale in-memory copy overwrite them on a regular update
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.ROLLUP_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     def calculate_progress(self):
         """
-        Calculate project progress based on tasks
+        Calculate project progress from the materialized task rollup
         """
-        total_tasks = self.tasks.count()
-        completed_tasks = self.tasks.filter(status='COMPLETED').count()
+        total_tasks = self.task_count
+        completed_tasks = self.completed_task_count
         return (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
 
     def is_overdue(self):
@@ -85,4 +101,18 @@ class Project(models.Model):
                 self.estimated_completion_date < timezone.now().date())
 
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        # Keyset pagination walks (ordering field, id) for each ordering_fields entry
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='project_created_keyset_idx'),
+            models.Index(fields=['start_date', 'id'], name='project_start_keyset_idx'),
+            models.Index(fields=['end_date', 'id'], name='project_end_keyset_idx'),
+            # List filters (filterset_fields) under the default ordering
+            models.Index(fields=['status', 'created_at', 'id'], name='project_status_created_idx'),
+            models.Index(fields=['priority', 'created_at', 'id'], name='project_priority_created_idx'),
+            models.Index(fields=['category', 'created_at', 'id'], name='project_category_created_idx'),
+            # Overdue counters: status IN (...) AND estimated_completion_date < today
+            models.Index(fields=['status', 'estimated_completion_date'], name='project_status_deadline_idx'),
+            # Calendar window: one range search per date column
+            models.Index(fields=['estimated_completion_date'], name='project_deadline_idx'),
+        ]
\ No newline at end of file
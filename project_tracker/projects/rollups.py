@@ -0,0 +1,70 @@
+# projects/rollups.py
+from django.apps import apps
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.changelog import record_changes
+from .models import Project
+
+# Projects corrected per UPDATE by rebuild_task_rollups
+REBUILD_BATCH_SIZE = 1000
+
+
+def apply_task_delta(project_id, total=0, completed=0):
+    """
+    Shift the task rollup of a single project by the given amounts. The
+    rollup is part of the project's representation, so updated_at moves too.
+    """
+    if not project_id or (total == 0 and completed == 0):
+        return
+    Project.objects.filter(pk=project_id).update(
+        task_count=F('task_count') + total,
+        completed_task_count=F('completed_task_count') + completed,
+        updated_at=timezone.now(),
+    )
+    record_changes('project', [project_id])
+
+
+def rebuild_task_rollups(project_ids=None, notify=True):
+    """
+    Recompute the task rollup from the tasks table. Only projects whose
+    counts are off are written, so a nightly rebuild of a consistent table
+    touches no rows and invalidates nothing. Pass notify=False when the
+    caller announces the change itself. Returns the number of projects
+    corrected.
+    """
+    from core.signals import notify_on_commit
+
+    Task = apps.get_model('tasks', 'Task')
+    counts = (
+        Task.objects.filter(project=OuterRef('pk'))
+        .order_by()
+        .values('project')
+        .annotate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status='COMPLETED')),
+        )
+    )
+    total = Coalesce(Subquery(counts.values('total'), output_field=IntegerField()), Value(0))
+    completed = Coalesce(Subquery(counts.values('completed'), output_field=IntegerField()), Value(0))
+    queryset = Project.objects.order_by()
+    if project_ids is not None:
+        queryset = queryset.filter(pk__in=project_ids)
+    stale = list(
+        queryset.annotate(actual_total=total, actual_completed=completed)
+        .filter(~Q(task_count=F('actual_total')) | ~Q(completed_task_count=F('actual_completed')))
+        .values_list('id', flat=True)
+    )
+    if not stale:
+        return 0
+
+    now = timezone.now()
+    for start in range(0, len(stale), REBUILD_BATCH_SIZE):
+        Project.objects.filter(pk__in=stale[start:start + REBUILD_BATCH_SIZE]).update(
+            task_count=total, completed_task_count=completed, updated_at=now,
+        )
+    record_changes('project', stale)
+    if notify:
+        notify_on_commit({'model': 'project', 'id': None, 'label': f'{len(stale)} projects', 'action': 'updated'})
+    return len(stale)
@@ -1,5 +1,6 @@
 # projects/serializers.py
 from rest_framework import serializers
+from core.serializers import SparseFieldsetsMixin
 from .models import Project, ProjectCategory
 
 class ProjectCategorySerializer(serializers.ModelSerializer):
@@ -7,7 +8,7 @@ class ProjectCategorySerializer(serializers.ModelSerializer):
         model = ProjectCategory
         fields = '__all__'
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     Comprehensive Project Serializer
     """
@@ -32,9 +33,34 @@ class ProjectSerializer(serializers.ModelSerializer):
             'progress', 'is_overdue'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        # Columns behind computed fields, for ?fields= / ?omit=
+        sparse_columns = {
+            'category': ['category'],
+            'progress': ['task_count', 'completed_task_count'],
+            'is_overdue': ['estimated_completion_date'],
+        }
 
     def get_progress(self, obj):
         return obj.calculate_progress()
 
+    def fast_progress(self):
+        """Columns and function mirroring Project.calculate_progress for FastListMixin"""
+        return ['task_count', 'completed_task_count'], lambda total, completed: (
+            (completed / total * 100) if total > 0 else 0
+        )
+
+    def fast_is_overdue(self):
+        # Reads the flag annotated by ProjectViewSet.get_queryset
+        return ['overdue'], lambda overdue: overdue
+
+    def fast_category(self):
+        # Same shape as ProjectCategorySerializer
+        return ['category__id', 'category__name', 'category__description'], lambda pk, name, description: (
+            None if pk is None else {'id': pk, 'name': name, 'description': description}
+        )
+
     def get_is_overdue(self, obj):
+        # Prefer the flag annotated by ProjectViewSet.get_queryset
+        if hasattr(obj, 'overdue'):
+            return obj.overdue
         return obj.is_overdue()
\ No newline at end of file
@@ -0,0 +1,13 @@
+# projects/tasks.py
+from celery import shared_task
+
+from core.jobs import MeteredTask
+from .rollups import rebuild_task_rollups
+
+
+@shared_task(base=MeteredTask)
+def rebuild_rollups(project_ids=None):
+    """
+    Recompute task rollups for `project_ids`, or every project when None
+    """
+    return rebuild_task_rollups(project_ids)
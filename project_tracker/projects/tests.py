@@ -1,3 +1,208 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.cache import get_data_version
+from core.models import ActivityEvent
+from core.queryplan import QueryPlanAssertions
+from core.stats import OPEN_PROJECT_STATUSES
+from .models import Project, ProjectCategory
+from .rollups import rebuild_task_rollups
+from .views import ProjectViewSet
+from tasks.models import Task
+
+
+class TaskRollupTests(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(name='Alpha')
+        self.other = Project.objects.create(name='Beta')
+
+    def assertRollup(self, project, total, completed):
+        project.refresh_from_db()
+        self.assertEqual((project.task_count, project.completed_task_count), (total, completed))
+
+    def test_create_update_delete(self):
+        task = Task.objects.create(title='One', project=self.project)
+        Task.objects.create(title='Two', project=self.project, status='COMPLETED')
+        self.assertRollup(self.project, 2, 1)
+
+        task.status = 'COMPLETED'
+        task.save()
+        self.assertRollup(self.project, 2, 2)
+
+        task.status = 'REVIEW'
+        task.save()
+        self.assertRollup(self.project, 2, 1)
+
+        task.delete()
+        self.assertRollup(self.project, 1, 1)
+
+    def test_project_reassignment(self):
+        task = Task.objects.create(title='Moving', project=self.project, status='COMPLETED')
+        task = Task.objects.get(pk=task.pk)
+        task.project = self.other
+        task.save()
+        self.assertRollup(self.project, 0, 0)
+        self.assertRollup(self.other, 1, 1)
+
+    def test_deferred_instance_save(self):
+        task = Task.objects.create(title='Deferred', project=self.project)
+        task = Task.objects.only('id', 'title').get(pk=task.pk)
+        task.status = 'COMPLETED'
+        with CaptureQueriesContext(connection) as queries:
+            task.save()
+        self.assertRollup(self.project, 1, 1)
+        # Rollup and activity share one lookup of the previous project/status
+        reads = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT') and 'FROM "tasks_task"' in q['sql']]
+        self.assertEqual(len(reads), 1)
+        self.assertTrue(ActivityEvent.objects.filter(kind=ActivityEvent.Kind.TASK_COMPLETED).exists())
+
+    def test_progress_reads_rollup_only(self):
+        Task.objects.create(title='One', project=self.project, status='COMPLETED')
+        Task.objects.create(title='Two', project=self.project)
+        project = Project.objects.get(pk=self.project.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(project.calculate_progress(), 50)
+
+    def test_rebuild_command(self):
+        Task.objects.bulk_create([
+            Task(title='Bulk', project=self.project, status='COMPLETED'),
+            Task(title='Bulk', project=self.project),
+        ])
+        self.assertRollup(self.project, 0, 0)
+        other_updated = self.other.updated_at
+        version = get_data_version()
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('rebuild_task_rollups', stdout=out)
+        self.assertIn('1 project(s)', out.getvalue())
+        self.assertRollup(self.project, 2, 1)
+        self.assertRollup(self.other, 0, 0)
+        self.assertEqual(self.other.updated_at, other_updated)
+        self.assertNotEqual(get_data_version(), version)
+
+        # Nothing left to correct: no writes, no invalidation
+        version = get_data_version()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.assertEqual(rebuild_task_rollups(), 0)
+        self.assertEqual(callbacks, [])
+        self.assertEqual(get_data_version(), version)
+
+    def test_project_save_keeps_rollup(self):
+        stale = Project.objects.get(pk=self.project.pk)
+        Task.objects.create(title='One', project=self.project)
+        stale.name = 'Renamed'
+        stale.save()
+        self.assertRollup(self.project, 1, 0)
+        self.assertEqual(self.project.name, 'Renamed')
+
+
+# Exercises the database path, not the response cache
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class ProjectListQueryTests(TestCase):
+    def create_projects(self, count):
+        today = timezone.now().date()
+        for i in range(count):
+            project = Project.objects.create(
+                name=f'Project {i}',
+                estimated_completion_date=today - timedelta(days=1) if i % 2 else None
+            )
+            Task.objects.create(title='Done', project=project, status='COMPLETED')
+            Task.objects.create(title='Open', project=project)
+
+    def test_list_query_count_is_constant(self):
+        self.create_projects(2)
+        with self.assertNumQueries(2):
+            self.client.get('/api/projects/projects/')
+        self.create_projects(6)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/projects/projects/')
+        results = response.json()['results']
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(row['progress'] == 50 for row in results))
+
+    def test_overdue_flag_matches_model(self):
+        self.create_projects(2)
+        Project.objects.create(name='Future', estimated_completion_date=timezone.now().date() + timedelta(days=3))
+        response = self.client.get('/api/projects/projects/')
+        for row in response.json()['results']:
+            project = Project.objects.get(pk=row['id'])
+            self.assertIs(row['is_overdue'], project.is_overdue())
+
+    def test_update_returns_fresh_overdue_flag(self):
+        project = Project.objects.create(name='Moving', estimated_completion_date=timezone.now().date() + timedelta(days=3))
+        url = f'/api/projects/projects/{project.pk}/'
+        past = (timezone.now().date() - timedelta(days=1)).isoformat()
+        response = self.client.patch(url, {'estimated_completion_date': past}, content_type='application/json')
+        self.assertIs(response.json()['is_overdue'], True)
+        self.assertIs(self.client.get(url).json()['is_overdue'], True)
+
+    def test_keyset_pagination(self):
+        self.create_projects(13)
+        ids, url, params = [], '/api/projects/projects/', {'cursor': '', 'ordering': 'start_date'}
+        while url:
+            body = self.client.get(url, params).json()
+            ids.extend(row['id'] for row in body['results'])
+            url, params = body['next'], {}
+        self.assertEqual(ids, list(Project.objects.order_by('id').values_list('id', flat=True)))
+
+    def test_sparse_fieldsets(self):
+        self.create_projects(3)
+        with self.assertNumQueries(2) as queries:
+            body = self.client.get('/api/projects/projects/', {'fields': 'id,name,progress'}).json()
+        self.assertEqual(body['results'][0], {'id': body['results'][0]['id'], 'name': body['results'][0]['name'], 'progress': 50.0})
+        select = queries.captured_queries[-1]['sql']
+        self.assertNotIn('JOIN', select)
+        self.assertNotIn('CASE', select)
+        response = self.client.get('/api/projects/projects/', {'fields': 'id,category_id'})
+        self.assertEqual(response.status_code, 400)
+        body = self.client.get('/api/projects/projects/', {'omit': 'description'}).json()
+        self.assertIn('category', body['results'][0])
+        self.assertIn('is_overdue', body['results'][0])
+
+    def test_fast_list_matches_serializer(self):
+        category = ProjectCategory.objects.create(name='Ops', description=None)
+        self.create_projects(4)
+        Project.objects.filter(name='Project 1').update(category=category, budget='1200.5', current_spend='3')
+        Project.objects.create(name='Empty')
+        for params in ({}, {'cursor': '', 'ordering': 'end_date'}, {'fields': 'id,category,progress'}):
+            cache.clear()
+            fast = self.client.get('/api/projects/projects/', params).content
+            cache.clear()
+            with mock.patch.object(ProjectViewSet, 'fast_list', False):
+                slow = self.client.get('/api/projects/projects/', params).content
+            self.assertEqual(fast, slow)
+
+
+class QueryPlanTests(QueryPlanAssertions, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = ProjectCategory.objects.create(name='Internal')
+        today = timezone.now().date()
+        for i in range(20):
+            Project.objects.create(name=f'Project {i}', category=self.category if i % 2 else None,
+                                   status=['PLANNING', 'COMPLETED'][i % 2],
+                                   estimated_completion_date=today + timedelta(days=i - 10))
+
+    def test_filtered_lists_use_an_index(self):
+        filters = {'status': 'PLANNING', 'priority': 'HIGH', 'category': self.category.id}
+        for name, value in filters.items():
+            for ordering in (None, 'start_date', '-end_date'):
+                params = {name: value, **({'ordering': ordering} if ordering else {})}
+                for pagination in ({}, {'cursor': ''}):
+                    with self.subTest(**params, **pagination):
+                        self.assertRequestIndexed('/api/projects/projects/', {**params, **pagination},
+                                                  'projects_project', ordered=ordering is None)
+
+    def test_overdue_query_uses_an_index(self):
+        self.assertQuerysetIndexed(Project.objects.filter(
+            estimated_completion_date__lt=timezone.now().date(),
+            status__in=OPEN_PROJECT_STATUSES,
+        ))
@@ -1,27 +1,37 @@
 # projects/views.py
 from rest_framework import viewsets, permissions, filters
 from django_filters.rest_framework import DjangoFilterBackend
+from core.export import ExportMixin
+from core.fastlist import FastListMixin
+from core.mixins import ConditionalGetMixin, KeysetPaginationMixin, ResponseCacheMixin
+from core.search import FullTextSearchFilter
+from core.serializers import model_columns, sparse_fields
+from django.db.models import BooleanField, Case, Value, When
+from django.utils import timezone
 from .models import Project, ProjectCategory
 from .serializers import ProjectSerializer, ProjectCategorySerializer
 
-class ProjectCategoryViewSet(viewsets.ModelViewSet):
+class ProjectCategoryViewSet(ResponseCacheMixin, viewsets.ModelViewSet):
     """
     ViewSet for Project Categories
     """
     queryset = ProjectCategory.objects.all()
     serializer_class = ProjectCategorySerializer
     permission_classes = [permissions.AllowAny,]
+    cache_dependencies = ('projectcategory',)
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ConditionalGetMixin, ResponseCacheMixin, KeysetPaginationMixin, FastListMixin, ExportMixin, viewsets.ModelViewSet):
     """
     Comprehensive Project ViewSet with advanced filtering
     """
-    queryset = Project.objects.all().prefetch_related('category')
+    queryset = Project.objects.all().select_related('category')
     serializer_class = ProjectSerializer
     permission_classes = [permissions.AllowAny,]
+    # Models read by the serialized representation (progress comes from tasks)
+    cache_dependencies = ('project', 'projectcategory', 'task')
     filter_backends = [
         DjangoFilterBackend, 
-        filters.SearchFilter, 
+        FullTextSearchFilter,
         filters.OrderingFilter
     ]
     
@@ -30,5 +40,34 @@ class ProjectViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'description']
     ordering_fields = ['created_at', 'start_date', 'end_date']
 
+    def get_queryset(self):
+        """
+        Resolve the overdue flag in SQL so serialization never re-reads the
+        clock per row; task totals come from the rollup columns
+        """
+        queryset = super().get_queryset()
+        if self.action in ('update', 'partial_update', 'destroy'):
+            # The flag would be read before the write; let the serializer
+            # compute it from the saved instance
+            return queryset
+        fields = sparse_fields(self.request, self.get_serializer_class())
+        if fields is not None:
+            # ?fields= / ?omit=: load only the columns and joins still needed
+            if 'category' not in fields:
+                queryset = queryset.select_related(None)
+            queryset = queryset.only(*model_columns(self.get_serializer_class(), fields))
+            if 'is_overdue' not in fields:
+                return queryset
+
+        today = timezone.now().date()
+        return queryset.annotate(
+            overdue=Case(
+                When(estimated_completion_date__isnull=True, then=Value(None)),
+                When(estimated_completion_date__lt=today, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(null=True),
+            )
+        )
+
     def perform_create(self, serializer):
         serializer.save()
\ No newline at end of file
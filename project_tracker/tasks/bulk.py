@@ -0,0 +1,86 @@
+# tasks/bulk.py
+from django.db import transaction
+from django.utils import timezone
+
+from core import activity
+from core.models import ActivityEvent
+from core.signals import bulk_write, notify_on_commit
+from core.changelog import record_changes
+from projects.rollups import rebuild_task_rollups
+from .models import Task
+
+# Largest payload accepted by the bulk endpoints
+MAX_BULK_SIZE = 1000
+BATCH_SIZE = 500
+
+
+def changed(action, count):
+    # Also covers the rollups: project views depend on the task generation
+    notify_on_commit({'model': 'task', 'id': None, 'label': f'{count} tasks', 'action': action})
+
+
+def bulk_create_tasks(rows):
+    """
+    Insert validated task rows in one transaction. Bulk inserts skip the
+    model signals, so rollups, activity and caches are updated per batch.
+    """
+    with transaction.atomic():
+        tasks = Task.objects.bulk_create([Task(**row) for row in rows], batch_size=BATCH_SIZE)
+        record_changes('task', [task.pk for task in tasks])
+        activity.record_many([
+            activity.event_for(ActivityEvent.Kind.TASK_CREATED, task, project_name=task.project.name)
+            for task in tasks
+        ])
+        rebuild_task_rollups({task.project_id for task in tasks}, notify=False)
+        changed('created', len(tasks))
+    return tasks
+
+
+def bulk_update_tasks(tasks, rows):
+    """
+    Apply validated partial `rows` to the matching loaded `tasks` and write
+    them with one bulk UPDATE per batch
+    """
+    fields = {'updated_at'}
+    project_ids = set()
+    completed = []
+    now = timezone.now()
+    for task, row in zip(tasks, rows):
+        project_ids.add(task.project_id)
+        was_completed = task.status == Task.Status.COMPLETED
+        for name, value in row.items():
+            setattr(task, name, value)
+        fields.update(row)
+        # auto_now is only applied by save()
+        task.updated_at = now
+        project_ids.add(task.project_id)
+        if task.status == Task.Status.COMPLETED and not was_completed:
+            completed.append(task)
+
+    with transaction.atomic():
+        Task.objects.bulk_update(tasks, sorted(fields), batch_size=BATCH_SIZE)
+        record_changes('task', [task.pk for task in tasks])
+        activity.record_many([
+            activity.event_for(ActivityEvent.Kind.TASK_COMPLETED, task, project_name=task.project.name)
+            for task in completed
+        ])
+        rebuild_task_rollups(project_ids, notify=False)
+        changed('updated', len(tasks))
+    return tasks
+
+
+def bulk_delete_tasks(queryset):
+    """
+    Delete every task in `queryset`. Returns the number of tasks deleted.
+    """
+    with transaction.atomic():
+        rows = list(queryset.order_by().values_list('id', 'project_id'))
+        if not rows:
+            return 0
+        ids = [pk for pk, _ in rows]
+        with bulk_write():
+            Task.objects.filter(pk__in=ids).delete()
+        record_changes('task', ids, deleted=True)
+        rebuild_task_rollups({project_id for _, project_id in rows}, notify=False)
+        changed('deleted', len(rows))
+    return len(rows)
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_project_project_created_keyset_idx_and_more'),
+        ('tasks', '0004_remove_task_owner'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['created_at', 'id'], name='task_created_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['due_date', 'id'], name='task_due_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['priority', 'id'], name='task_priority_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0008_project_project_status_created_idx_and_more'),
+        ('tasks', '0005_task_task_created_keyset_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='task_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['priority', 'created_at', 'id'], name='task_priority_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'created_at', 'id'], name='task_project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'due_date'], name='task_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'completed_date'], name='task_status_completed_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0009_project_project_deadline_idx'),
+        ('tasks', '0006_task_task_status_created_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['start_date'], name='task_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['completed_date'], name='task_completed_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0010_project_project_sync_idx'),
+        ('tasks', '0007_task_task_start_idx_task_task_completed_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['updated_at', 'id'], name='task_sync_idx'),
+        ),
+    ]
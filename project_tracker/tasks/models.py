@@ -78,4 +78,21 @@ class Task(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        # Keyset pagination walks (ordering field, id) for each ordering_fields entry
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='task_created_keyset_idx'),
+            models.Index(fields=['due_date', 'id'], name='task_due_keyset_idx'),
+            models.Index(fields=['priority', 'id'], name='task_priority_keyset_idx'),
+            # List filters (filterset_fields) under the default ordering
+            models.Index(fields=['status', 'created_at', 'id'], name='task_status_created_idx'),
+            models.Index(fields=['priority', 'created_at', 'id'], name='task_priority_created_idx'),
+            models.Index(fields=['project', 'created_at', 'id'], name='task_project_created_idx'),
+            # Overdue counters and sweeps: status IN (...) AND due_date < today
+            models.Index(fields=['status', 'due_date'], name='task_status_due_idx'),
+            # Completion charts: status = COMPLETED AND completed_date BETWEEN ...
+            models.Index(fields=['status', 'completed_date'], name='task_status_completed_idx'),
+            # Calendar window: one range search per date column
+            models.Index(fields=['start_date'], name='task_start_idx'),
+            models.Index(fields=['completed_date'], name='task_completed_idx'),
+        ]
 
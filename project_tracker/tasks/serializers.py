@@ -1,12 +1,16 @@
 # tasks/serializers.py
 from rest_framework import serializers
+from django.utils import timezone
+from core.serializers import PrefetchedPrimaryKeyRelatedField, SparseFieldsetsMixin
+from projects.models import Project
 from .models import Task
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     Comprehensive Task Serializer
     """
     is_overdue = serializers.SerializerMethodField()
+    project = PrefetchedPrimaryKeyRelatedField(queryset=Project.objects.all())
     project_name = serializers.CharField(
         source='project.name', 
         read_only=True
@@ -24,6 +28,19 @@ class TaskSerializer(serializers.ModelSerializer):
             'is_overdue'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        # Columns behind computed fields, for ?fields= / ?omit=
+        sparse_columns = {
+            'project_name': ['project__name'],
+            'is_overdue': ['due_date', 'status'],
+        }
 
     def get_is_overdue(self, obj):
-        return obj.is_overdue()
\ No newline at end of file
+        return obj.is_overdue()
+
+    def fast_is_overdue(self):
+        """Columns and function mirroring Task.is_overdue for FastListMixin"""
+        today = timezone.now().date()
+        completed = Task.Status.COMPLETED
+        return ['due_date', 'status'], lambda due_date, status: (
+            due_date and due_date < today and status != completed
+        )
\ No newline at end of file
@@ -0,0 +1,41 @@
+# tasks/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.signals import in_bulk_write, previous_state
+from projects.rollups import apply_task_delta
+from .models import Task
+
+
+def _rollup_state(state):
+    return state['project_id'], state['status'] == Task.Status.COMPLETED
+
+
+@receiver(post_save, sender=Task)
+def update_rollup_on_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Apply the save to the project rollup as a delta against the
+    project/status pair tracked by core.signals
+    """
+    if raw:
+        return
+    project_id, completed = _rollup_state({'project_id': instance.project_id, 'status': instance.status})
+    previous = previous_state(instance, created)
+    if previous is None:
+        apply_task_delta(project_id, total=1, completed=int(completed))
+        return
+    previous = _rollup_state(previous)
+    if previous[0] != project_id:
+        apply_task_delta(previous[0], total=-1, completed=-int(previous[1]))
+        apply_task_delta(project_id, total=1, completed=int(completed))
+    elif previous[1] != completed:
+        apply_task_delta(project_id, completed=1 if completed else -1)
+
+
+@receiver(post_delete, sender=Task)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    if in_bulk_write():
+        return
+    state = previous_state(instance) or {'project_id': instance.project_id, 'status': instance.status}
+    project_id, completed = _rollup_state(state)
+    apply_task_delta(project_id, total=-1, completed=-int(completed))
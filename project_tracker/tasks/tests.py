@@ -1,3 +1,261 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from core.cache import get_data_version
+from core.models import ActivityEvent
+from core.queryplan import QueryPlanAssertions
+from core.stats import OPEN_TASK_STATUSES
+from projects.models import Project
+from .models import Task
+from .views import TaskViewSet
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        project = Project.objects.create(name='Alpha')
+        priorities = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
+        for i in range(37):
+            Task.objects.create(
+                title=f'Task {i}',
+                project=project,
+                priority=priorities[i % 4],
+                due_date=None if i % 5 == 0 else date(2025, 1, 1) + timedelta(days=i % 7),
+            )
+
+    def walk(self, params):
+        ids = []
+        url = '/api/tasks/tasks/'
+        params = {**params, 'cursor': ''}
+        while url:
+            with self.assertNumQueries(1):
+                body = self.client.get(url, params).json()
+            self.assertNotIn('count', body)
+            ids.extend(row['id'] for row in body['results'])
+            url, params = body['next'], {}
+        return ids
+
+    def expected(self, field, descending):
+        rows = list(Task.objects.values_list('id', field))
+        present = sorted((r for r in rows if r[1] is not None),
+                         key=lambda r: (r[1], r[0]), reverse=descending)
+        missing = sorted((r for r in rows if r[1] is None), key=lambda r: r[0], reverse=descending)
+        return [r[0] for r in present + missing]
+
+    def test_default_ordering(self):
+        self.assertEqual(self.walk({}), self.expected('created_at', True))
+
+    def test_every_ordering_field(self):
+        for field in ('created_at', 'due_date', 'priority'):
+            for descending in (False, True):
+                with self.subTest(field=field, descending=descending):
+                    ordering = f'-{field}' if descending else field
+                    self.assertEqual(self.walk({'ordering': ordering}), self.expected(field, descending))
+
+    def test_filters_are_kept_across_pages(self):
+        ids = self.walk({'priority': 'HIGH', 'ordering': 'due_date'})
+        self.assertEqual(set(ids), set(Task.objects.filter(priority='HIGH').values_list('id', flat=True)))
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/tasks/tasks/', {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_number_pagination_is_default(self):
+        body = self.client.get('/api/tasks/tasks/').json()
+        self.assertEqual(body['count'], 37)
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        project = Project.objects.create(name='Alpha')
+        for i in range(3):
+            Task.objects.create(title=f'Task {i}', description='x' * 1000, project=project)
+
+    def test_fields_trim_payload_and_sql(self):
+        with self.assertNumQueries(2) as queries:
+            body = self.client.get('/api/tasks/tasks/', {'fields': 'id,title,due_date'}).json()
+        self.assertEqual(list(body['results'][0]), ['id', 'title', 'due_date'])
+        select = queries.captured_queries[-1]['sql']
+        self.assertNotIn('description', select)
+        self.assertNotIn('JOIN', select)
+
+    def test_omit_keeps_needed_join(self):
+        with self.assertNumQueries(2) as queries:
+            body = self.client.get('/api/tasks/tasks/', {'omit': 'description,is_overdue'}).json()
+        row = body['results'][0]
+        self.assertNotIn('description', row)
+        self.assertEqual(row['project_name'], 'Alpha')
+        self.assertNotIn('"description"', queries.captured_queries[-1]['sql'])
+
+    def test_unknown_field(self):
+        response = self.client.get('/api/tasks/tasks/', {'fields': 'id,nope'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_sparse_with_keyset_cursor(self):
+        body = self.client.get('/api/tasks/tasks/', {'fields': 'id', 'cursor': '', 'ordering': 'due_date'}).json()
+        self.assertEqual(len(body['results']), 3)
+
+
+class FastListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        project = Project.objects.create(name='Alpha')
+        today = date.today()
+        for i in range(12):
+            Task.objects.create(
+                title=f'Task {i} – ünïcode',
+                description=None if i % 3 else 'Some "quoted" text',
+                project=project,
+                status=['TODO', 'COMPLETED', 'BLOCKED'][i % 3],
+                due_date=None if i % 4 == 0 else today + timedelta(days=i - 6),
+                completed_date=today if i % 3 == 1 else None,
+                estimated_hours=None if i % 2 else '3.5',
+                actual_hours='1.25',
+            )
+
+    def assertSameBytes(self, params):
+        cache.clear()
+        fast = self.client.get('/api/tasks/tasks/', params).content
+        cache.clear()
+        with mock.patch.object(TaskViewSet, 'fast_list', False):
+            slow = self.client.get('/api/tasks/tasks/', params).content
+        self.assertEqual(fast, slow)
+
+    def test_output_matches_serializer(self):
+        for params in ({}, {'page': 2}, {'ordering': 'due_date'}, {'cursor': ''},
+                       {'fields': 'id,is_overdue,project_name'}, {'omit': 'description'}):
+            with self.subTest(params=params):
+                self.assertSameBytes(params)
+
+    def test_no_model_instances_built(self):
+        with mock.patch.object(Task, '__init__', side_effect=AssertionError('model instantiated')):
+            response = self.client.get('/api/tasks/tasks/')
+        self.assertEqual(response.status_code, 200)
+
+
+class QueryPlanTests(QueryPlanAssertions, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(name='Alpha')
+        for i in range(20):
+            Task.objects.create(title=f'Task {i}', project=self.project,
+                                status=['TODO', 'COMPLETED'][i % 2],
+                                due_date=date(2025, 1, 1) + timedelta(days=i),
+                                completed_date=date(2025, 1, 1) + timedelta(days=i) if i % 2 else None)
+
+    def test_filtered_lists_use_an_index(self):
+        filters = {'status': 'TODO', 'priority': 'HIGH', 'project': self.project.id}
+        for name, value in filters.items():
+            for ordering in (None, 'due_date', '-priority'):
+                params = {name: value, **({'ordering': ordering} if ordering else {})}
+                for pagination in ({}, {'cursor': ''}):
+                    with self.subTest(**params, **pagination):
+                        self.assertRequestIndexed('/api/tasks/tasks/', {**params, **pagination},
+                                                  'tasks_task', ordered=ordering is None)
+
+    def test_dashboard_queries_use_an_index(self):
+        today = date(2025, 1, 10)
+        self.assertQuerysetIndexed(Task.objects.filter(due_date__lt=today, status__in=OPEN_TASK_STATUSES))
+        self.assertQuerysetIndexed(Task.objects.filter(
+            status='COMPLETED', completed_date__gte=date(2025, 1, 1), completed_date__lte=today,
+        ))
+
+
+class BulkEndpointTests(TestCase):
+    url = '/api/tasks/tasks/bulk/'
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_user('editor', password='pass12345'))
+        self.alpha = Project.objects.create(name='Alpha')
+        self.beta = Project.objects.create(name='Beta')
+
+    def send(self, method, data=None, **params):
+        url = self.url
+        if params:
+            url += '?' + '&'.join(f'{k}={v}' for k, v in params.items())
+        return getattr(self.client, method)(url, data, content_type='application/json')
+
+    def test_create_in_one_batch(self):
+        rows = [{'title': f'Task {i}', 'project': [self.alpha.id, self.beta.id][i % 2],
+                 'status': 'COMPLETED' if i < 4 else 'TODO'} for i in range(50)]
+        version = get_data_version()
+        # session and user, project lookup, then savepoint, insert, change log, activity insert,
+        # stale rollups, rollup update, rollup change log, release
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(11):
+            response = self.send('post', rows)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([row['title'] for row in response.json()], [row['title'] for row in rows])
+        self.alpha.refresh_from_db()
+        self.assertEqual((self.alpha.task_count, self.alpha.completed_task_count), (25, 2))
+        self.assertEqual(ActivityEvent.objects.filter(kind='TASK_CREATED').count(), 50)
+        self.assertGreater(get_data_version(), version)
+
+    def test_create_reports_per_item_errors_and_writes_nothing(self):
+        response = self.send('post', [
+            {'title': 'Good', 'project': self.alpha.id},
+            {'project': self.alpha.id},
+            {'title': 'Bad project', 'project': 999},
+        ])
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(errors[0], {})
+        self.assertIn('title', errors[1])
+        self.assertIn('project', errors[2])
+        self.assertFalse(Task.objects.exists())
+        self.assertEqual(self.send('post', []).status_code, 400)
+        self.assertEqual(self.send('post', {'title': 'Not a list'}).status_code, 400)
+
+    def test_update_in_one_batch(self):
+        tasks = [Task.objects.create(title=f'Task {i}', project=self.alpha) for i in range(5)]
+        rows = [{'id': task.id, 'status': 'COMPLETED'} for task in tasks[:3]]
+        rows.append({'id': tasks[3].id, 'project': self.beta.id, 'priority': 'HIGH'})
+        response = self.send('patch', rows)
+        self.assertEqual(response.status_code, 200)
+        self.alpha.refresh_from_db()
+        self.beta.refresh_from_db()
+        self.assertEqual((self.alpha.task_count, self.alpha.completed_task_count), (4, 3))
+        self.assertEqual((self.beta.task_count, self.beta.completed_task_count), (1, 0))
+        moved = Task.objects.get(pk=tasks[3].id)
+        self.assertEqual((moved.project_id, moved.priority, moved.title), (self.beta.id, 'HIGH', 'Task 3'))
+        self.assertGreater(moved.updated_at, tasks[3].updated_at)
+        self.assertEqual(ActivityEvent.objects.filter(kind='TASK_COMPLETED').count(), 3)
+
+    def test_update_reports_unknown_ids(self):
+        task = Task.objects.create(title='Task', project=self.alpha)
+        response = self.send('patch', [
+            {'id': task.id, 'status': 'COMPLETED'},
+            {'id': 999, 'status': 'COMPLETED'},
+            {'id': task.id, 'status': 'bogus'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(errors[0], {})
+        self.assertIn('id', errors[1])
+        self.assertEqual(set(errors[2]), {'id', 'status'})
+        self.assertEqual(Task.objects.get().status, 'TODO')
+
+    def test_delete_by_filter(self):
+        for i in range(6):
+            Task.objects.create(title=f'Task {i}', project=self.alpha, status='COMPLETED' if i % 2 else 'TODO')
+        Task.objects.create(title='Other', project=self.beta, status='COMPLETED')
+        self.assertEqual(self.send('delete').status_code, 400)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.send('delete', status='COMPLETED', project=self.alpha.id)
+        self.assertEqual(response.json(), {'deleted': 3})
+        self.assertEqual(len(callbacks), 1)
+        self.alpha.refresh_from_db()
+        self.assertEqual((self.alpha.task_count, self.alpha.completed_task_count), (3, 0))
+        self.assertEqual(Task.objects.filter(project=self.beta).count(), 1)
+
+    def test_requires_a_session(self):
+        Task.objects.create(title='Task', project=self.alpha)
+        self.client.logout()
+        self.assertEqual(self.send('delete', status='TODO').status_code, 403)
+        self.assertEqual(self.send('post', [{'title': 'New', 'project': self.alpha.id}]).status_code, 403)
+        self.assertEqual(Task.objects.count(), 1)
@@ -1,19 +1,33 @@
 # tasks/views.py
-from rest_framework import viewsets, permissions, filters
+from rest_framework import viewsets, permissions, filters, status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend
+from core.export import ExportMixin
+from core.fastlist import FastListMixin
+from core.mixins import ConditionalGetMixin, KeysetPaginationMixin, ResponseCacheMixin
+from core.search import FullTextSearchFilter
+from core.serializers import model_columns, sparse_fields
+from projects.models import Project
+from .bulk import MAX_BULK_SIZE, bulk_create_tasks, bulk_delete_tasks, bulk_update_tasks
 from .models import Task
 from .serializers import TaskSerializer
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ConditionalGetMixin, ResponseCacheMixin, KeysetPaginationMixin, FastListMixin, ExportMixin, viewsets.ModelViewSet):
     """
     Comprehensive Task ViewSet with advanced filtering
     """
     queryset = Task.objects.all().select_related('project')
     serializer_class = TaskSerializer
     permission_classes = [permissions.AllowAny,]
+    # Models read by the serialized representation (project_name comes from projects)
+    cache_dependencies = ('task', 'project')
     filter_backends = [
         DjangoFilterBackend, 
-        filters.SearchFilter, 
+        FullTextSearchFilter,
         filters.OrderingFilter
     ]
     
@@ -22,5 +36,81 @@ class TaskViewSet(viewsets.ModelViewSet):
     search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'due_date', 'priority']
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = sparse_fields(self.request, self.get_serializer_class())
+        if fields is None:
+            return queryset
+        # ?fields= / ?omit=: skip the project join unless project_name is wanted
+        if 'project_name' not in fields:
+            queryset = queryset.select_related(None)
+        return queryset.only(*model_columns(self.get_serializer_class(), fields))
+
     def perform_create(self, serializer):
         serializer.save()
+
+    def get_bulk_serializer(self, rows, **kwargs):
+        """
+        List serializer validating a whole bulk payload, with every referenced
+        project loaded up front; errors come back as one entry per row
+        """
+        context = self.get_serializer_context()
+        if isinstance(rows, list):
+            ids = {row.get('project') for row in rows if isinstance(row, dict)}
+            context['prefetched'] = {
+                'project': Project.objects.in_bulk([pk for pk in ids if isinstance(pk, int)]),
+            }
+        return TaskSerializer(data=rows, many=True, allow_empty=False, max_length=MAX_BULK_SIZE,
+                              context=context, **kwargs)
+
+    # A single request can rewrite or delete many rows, so unlike the per-row
+    # endpoints the bulk ones (every method below) need a signed-in session
+    @action(detail=False, methods=['post'], authentication_classes=[SessionAuthentication],
+            permission_classes=[permissions.IsAuthenticated])
+    def bulk(self, request):
+        """
+        Create a list of tasks in one transaction; nothing is written if any
+        row is invalid
+        """
+        serializer = self.get_bulk_serializer(request.data)
+        serializer.is_valid(raise_exception=True)
+        tasks = bulk_create_tasks(serializer.validated_data)
+        return Response(self.get_serializer(tasks, many=True).data, status=status.HTTP_201_CREATED)
+
+    @bulk.mapping.patch
+    def bulk_update(self, request):
+        """
+        Partially update a list of tasks, each row identified by its `id`
+        """
+        rows = request.data
+        serializer = self.get_bulk_serializer(rows, partial=True)
+        if not serializer.is_valid() and not isinstance(serializer.errors, list):
+            raise ValidationError(serializer.errors)
+        errors = list(serializer.errors) or [{} for _ in rows]
+
+        ids = [row.get('id') if isinstance(row, dict) else None for row in rows]
+        tasks = self.get_queryset().in_bulk([pk for pk in ids if isinstance(pk, int)])
+        seen = set()
+        for index, pk in enumerate(ids):
+            if pk not in tasks:
+                errors[index] = {**errors[index], 'id': ['No task with this id.']}
+            elif pk in seen:
+                errors[index] = {**errors[index], 'id': ['Task listed more than once.']}
+            seen.add(pk)
+        if any(errors):
+            raise ValidationError(errors)
+
+        updated = bulk_update_tasks([tasks[pk] for pk in ids], serializer.validated_data)
+        return Response(self.get_serializer(updated, many=True).data)
+
+    @bulk.mapping.delete
+    def bulk_destroy(self, request):
+        """
+        Delete every task matching the list filters (?status=, ?project=,
+        ?search=, ...); at least one filter is required
+        """
+        params = [*self.filterset_fields, api_settings.SEARCH_PARAM]
+        if not any(request.query_params.get(name) for name in params):
+            raise ValidationError({'detail': f'Bulk delete needs at least one of: {", ".join(params)}'})
+        deleted = bulk_delete_tasks(self.filter_queryset(self.get_queryset()))
+        return Response({'deleted': deleted})
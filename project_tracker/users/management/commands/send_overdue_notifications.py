@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from users.notifications import send_overdue_notifications
+
+
+class Command(BaseCommand):
+    help = 'Create overdue-task notifications for all users (run periodically)'
+
+    def handle(self, *args, **options):
+        created = send_overdue_notifications()
+        self.stdout.write(self.style.SUCCESS(f'Created {created} overdue notification(s)'))
@@ -29,3 +29,8 @@ class UserNotification(models.Model):
 
     def __str__(self):
         return f"Notification for {self.user.username}: {self.message[:30]}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='notification_user_recent_idx'),
+        ]
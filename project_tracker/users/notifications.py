@@ -0,0 +1,49 @@
+# users/notifications.py
+from django.db.models import Count
+from django.utils import timezone
+
+from tasks.models import Task
+from .models import UserNotification
+
+# Every status except COMPLETED counts towards a user's overdue total
+OVERDUE_STATUSES = ['TODO', 'IN_PROGRESS', 'REVIEW', 'BLOCKED']
+
+
+def overdue_message(count):
+    return f"You have {count} overdue task{'s' if count != 1 else ''}."
+
+
+def send_overdue_notifications(today=None):
+    """
+    Notify every team member about their overdue tasks. Counts come from one
+    grouped query; users who already have the same unread message are skipped.
+    Returns the number of notifications created.
+    """
+    today = today or timezone.now().date()
+    counts = (
+        Task.objects.filter(
+            due_date__lt=today,
+            status__in=OVERDUE_STATUSES,
+            project__team_members__isnull=False,
+        )
+        .order_by()
+        .values('project__team_members')
+        .annotate(overdue=Count('id', distinct=True))
+    )
+    messages = {row['project__team_members']: overdue_message(row['overdue']) for row in counts}
+    if not messages:
+        return 0
+
+    existing = set(
+        UserNotification.objects.filter(
+            user_id__in=messages.keys(),
+            message__in=set(messages.values()),
+            is_read=False,
+        ).values_list('user_id', 'message')
+    )
+    created = UserNotification.objects.bulk_create([
+        UserNotification(user_id=user_id, message=message)
+        for user_id, message in messages.items()
+        if (user_id, message) not in existing
+    ], batch_size=1000)
+    return len(created)
@@ -0,0 +1,13 @@
+# users/tasks.py
+from celery import shared_task
+
+from core.jobs import MeteredTask
+from .notifications import send_overdue_notifications
+
+
+@shared_task(base=MeteredTask)
+def notify_overdue():
+    """
+    Overdue-task notification sweep for every team member
+    """
+    return send_overdue_notifications()
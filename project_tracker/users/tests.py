@@ -1,3 +1,94 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from tasks.models import Task
+from core.activity import record_overdue_tasks
+from core.stats import user_counters
+from .models import UserNotification
+from .notifications import send_overdue_notifications
+
+
+class UserQuickStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('member', password='pass12345')
+        other = User.objects.create_user('other', password='pass12345')
+        mine = Project.objects.create(name='Mine', status='IN_PROGRESS')
+        mine.team_members.add(self.user, other)
+        done = Project.objects.create(name='Done', status='COMPLETED')
+        done.team_members.add(self.user)
+        theirs = Project.objects.create(name='Theirs')
+        theirs.team_members.add(other)
+        Task.objects.create(title='A', project=mine, status='COMPLETED')
+        Task.objects.create(title='B', project=mine)
+        Task.objects.create(title='C', project=theirs)
+
+    def test_counters_one_query_per_table(self):
+        with self.assertNumQueries(2):
+            stats = user_counters(self.user)
+        self.assertEqual(stats, {
+            'total_projects': 2,
+            'active_projects': 1,
+            'completed_projects': 1,
+            'total_tasks': 2,
+            'completed_tasks': 1,
+        })
+
+    def test_quick_stats_cached_until_membership_changes(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get('/users/api/users/quick-stats/').json()['total_projects'], 2)
+        with self.assertNumQueries(0):
+            client.get('/users/api/users/quick-stats/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.get(name='Theirs').team_members.add(self.user)
+        self.assertEqual(client.get('/users/api/users/quick-stats/').json()['total_projects'], 3)
+
+    def test_profile_uses_shared_stats(self):
+        self.client.force_login(self.user)
+        response = self.client.get('/users/profile/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_tasks'], 2)
+
+
+class OverdueNotificationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('member', password='pass12345')
+        self.other = User.objects.create_user('other', password='pass12345')
+        project = Project.objects.create(name='Late')
+        project.team_members.add(self.user, self.other)
+        solo = Project.objects.create(name='Solo')
+        solo.team_members.add(self.user)
+        yesterday = timezone.now().date() - timedelta(days=1)
+        for target in (project, project, solo):
+            Task.objects.create(title='Late', project=target, due_date=yesterday)
+        Task.objects.create(title='Done', project=project, due_date=yesterday, status='COMPLETED')
+
+    def test_sweep_creates_and_dedupes(self):
+        with self.assertNumQueries(3):
+            self.assertEqual(send_overdue_notifications(), 2)
+        messages = dict(UserNotification.objects.values_list('user__username', 'message'))
+        self.assertEqual(messages, {
+            'member': 'You have 3 overdue tasks.',
+            'other': 'You have 2 overdue tasks.',
+        })
+        self.assertEqual(send_overdue_notifications(), 0)
+
+    def test_list_is_read_only(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.assertNumQueries(1):
+            response = client.get('/users/api/users/notifications/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(UserNotification.objects.exists())
 
-# Create your tests here.
+    def test_overdue_activity_logged_once(self):
+        self.assertEqual(record_overdue_tasks(), 3)
+        self.assertEqual(record_overdue_tasks(), 0)
@@ -21,6 +21,15 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework import status
 from django.utils import timezone
+from core.cache import get_snapshot
+from core.stats import user_counters
+
+
+def user_stats(user):
+    """
+    Quick stats for `user`, cached per user until the next data write
+    """
+    return get_snapshot('user-stats', lambda: user_counters(user), user.pk)
 
 def register(request):
     """
@@ -112,27 +121,7 @@ def profile(request):
     """
     User profile view
     """
-    from projects.models import Project
-    from tasks.models import Task
-    
-    # Get user's projects and tasks
-    user_projects = Project.objects.filter(team_members=request.user)
-    user_tasks = Task.objects.filter(project__team_members=request.user)
-    
-    # Calculate statistics
-    total_projects = user_projects.count()
-    active_projects = user_projects.filter(status='IN_PROGRESS').count()
-    completed_projects = user_projects.filter(status='COMPLETED').count()
-    total_tasks = user_tasks.count()
-    completed_tasks = user_tasks.filter(status='COMPLETED').count()
-    
-    context = {
-        'total_projects': total_projects,
-        'active_projects': active_projects,
-        'completed_projects': completed_projects,
-        'total_tasks': total_tasks,
-        'completed_tasks': completed_tasks,
-    }
+    context = user_stats(request.user)
     
     return render(request, 'registration/profile.html', context)
 
@@ -203,33 +192,14 @@ class UserSettingsView(generics.RetrieveUpdateAPIView):
 class UserQuickStatsView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     def get(self, request):
-        user = request.user
-        total_projects = Project.objects.filter(team_members=user).count()
-        active_projects = Project.objects.filter(team_members=user, status='IN_PROGRESS').count()
-        completed_projects = Project.objects.filter(team_members=user, status='COMPLETED').count()
-        total_tasks = Task.objects.filter(project__team_members=user).count()
-        completed_tasks = Task.objects.filter(project__team_members=user, status='COMPLETED').count()
-        return Response({
-            'total_projects': total_projects,
-            'active_projects': active_projects,
-            'completed_projects': completed_projects,
-            'total_tasks': total_tasks,
-            'completed_tasks': completed_tasks,
-        })
+        return Response(user_stats(request.user))
 
 class UserNotificationListView(generics.ListAPIView):
     serializer_class = UserNotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
     def get_queryset(self):
-        user = self.request.user
-        # Check for overdue tasks and create a notification if needed
-        overdue_tasks = Task.objects.filter(project__team_members=user, due_date__lt=timezone.now().date(), status__in=['TODO', 'IN_PROGRESS', 'REVIEW', 'BLOCKED'])
-        if overdue_tasks.exists():
-            message = f"You have {overdue_tasks.count()} overdue task{'s' if overdue_tasks.count() != 1 else ''}."
-            # Only create a new notification if one doesn't already exist and is unread
-            if not UserNotification.objects.filter(user=user, message=message, is_read=False).exists():
-                UserNotification.objects.create(user=user, message=message)
-        return UserNotification.objects.filter(user=user).order_by('-created_at')
+        # Overdue notifications are generated by the send_overdue_notifications job
+        return UserNotification.objects.filter(user=self.request.user).order_by('-created_at')
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])